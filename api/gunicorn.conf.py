@@ -0,0 +1,36 @@
+"""
+gunicorn config for the Privacy MCP backend
+
+    cd api && gunicorn -c gunicorn.conf.py
+
+The app is preloaded in the master, which runs one aggregation before
+forking. Every worker starts a refresh thread, but only the one holding
+the poller lock (PRIVACY_POLLER_LOCK) fetches upstream; the rest pick up
+its writes from the item store.
+"""
+
+import multiprocessing
+import os
+
+wsgi_app = 'privacy_mcp:create_app()'
+bind = os.environ.get('PRIVACY_MCP_BIND', '0.0.0.0:5003')
+
+workers = int(os.environ.get('PRIVACY_MCP_WORKERS', min(multiprocessing.cpu_count(), 4)))
+worker_class = 'gthread'
+threads = int(os.environ.get('PRIVACY_MCP_THREADS', 8))
+keepalive = int(os.environ.get('PRIVACY_MCP_KEEPALIVE', 5))
+timeout = 60
+graceful_timeout = 30
+
+preload_app = True
+accesslog = '-'
+
+
+def when_ready(server):
+    import privacy_mcp
+    privacy_mcp.warm_start()
+
+
+def post_fork(server, worker):
+    import privacy_mcp
+    privacy_mcp.start_background_refresh()
@@ -0,0 +1,333 @@
+"""
+Privacy Feed Indexes
+In-process indexes maintained by PrivacyAggregator as items are ingested
+"""
+
+import bisect
+import hashlib
+import heapq
+import math
+import re
+from collections import Counter
+
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+# Title terms count this many times toward term frequency
+TITLE_WEIGHT = 2
+
+
+def tokenize(text):
+    """Lowercase word tokens, dropping single characters"""
+    return [t for t in TOKEN_RE.findall((text or '').lower()) if len(t) > 1]
+
+
+class InvertedIndex:
+    """
+    Token -> posting list index with BM25 ranking
+
+    Postings map each token to {doc_id: term frequency}; token positions
+    are kept per document for phrase queries. Documents can be re-added
+    (the old postings are dropped first) or removed, so the index tracks
+    the item store as feeds refresh.
+    """
+
+    def __init__(self, k1=1.2, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings = {}
+        self.doc_terms = {}
+        self.doc_positions = {}
+        self.doc_len = {}
+        self.total_len = 0
+
+    def __len__(self):
+        return len(self.doc_len)
+
+    def add(self, doc_id, title, content):
+        """Index (or re-index) a document"""
+        if doc_id in self.doc_terms:
+            self.remove(doc_id)
+
+        title_tokens, content_tokens = tokenize(title), tokenize(content)
+        terms = Counter(content_tokens)
+        for token in title_tokens:
+            terms[token] += TITLE_WEIGHT
+
+        # Title then content, one position apart so no phrase spans the two
+        positions = {}
+        for i, token in enumerate(title_tokens + [None] + content_tokens):
+            if token is not None:
+                positions.setdefault(token, set()).add(i)
+        self.doc_positions[doc_id] = positions
+
+        for token, tf in terms.items():
+            self.postings.setdefault(token, {})[doc_id] = tf
+        self.doc_terms[doc_id] = terms
+        self.doc_len[doc_id] = sum(terms.values())
+        self.total_len += self.doc_len[doc_id]
+
+    def remove(self, doc_id):
+        """Drop a document's postings"""
+        terms = self.doc_terms.pop(doc_id, None)
+        if terms is None:
+            return
+        del self.doc_positions[doc_id]
+        for token in terms:
+            posting = self.postings.get(token)
+            if posting is not None:
+                posting.pop(doc_id, None)
+                if not posting:
+                    del self.postings[token]
+        self.total_len -= self.doc_len.pop(doc_id)
+
+    def _idf(self, df):
+        n = len(self.doc_len)
+        return math.log(1 + (n - df + 0.5) / (df + 0.5))
+
+    def _has_phrase(self, doc_id, tokens):
+        positions = self.doc_positions[doc_id]
+        return any(all(start + i in positions[token] for i, token in enumerate(tokens[1:], 1))
+                   for start in positions[tokens[0]])
+
+    def search(self, queries, limit=50, accept=None):
+        """
+        Rank documents matching any of the queries
+
+        Each query is a keyword or phrase; a document matches a phrase when
+        it contains its tokens next to each other and in order. Matches
+        across queries are OR'd and their BM25 scores summed, all in one
+        pass over the posting lists.
+
+        Args:
+            queries: List of query strings
+            limit: Maximum results
+            accept: Optional predicate on doc_id; rejected docs are skipped
+
+        Returns:
+            List of (score, doc_id), best first
+        """
+        if not self.doc_len:
+            return []
+
+        avg_len = self.total_len / len(self.doc_len)
+        scores = {}
+
+        for query in queries:
+            phrase = tokenize(query)
+            tokens = list(dict.fromkeys(phrase))
+            posting_lists = [self.postings.get(t) for t in tokens]
+            if not tokens or not all(posting_lists):
+                continue
+
+            # Intersect starting from the rarest token
+            ordered = sorted(zip(tokens, posting_lists), key=lambda tp: len(tp[1]))
+            candidates = set(ordered[0][1])
+            for _, posting in ordered[1:]:
+                candidates.intersection_update(posting)
+            if len(phrase) > 1:
+                candidates = {doc_id for doc_id in candidates if self._has_phrase(doc_id, phrase)}
+
+            for token, posting in ordered:
+                idf = self._idf(len(posting))
+                for doc_id in candidates:
+                    tf = posting[doc_id]
+                    norm = self.k1 * (1 - self.b + self.b * self.doc_len[doc_id] / avg_len)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+
+        return heapq.nlargest(limit, ((score, doc_id) for doc_id, score in scores.items()
+                                      if accept is None or accept(doc_id)))
+
+
+class DateIndex:
+    """
+    Sorted (published, doc_id) keys for range lookups
+
+    Published dates are ISO strings, so string order is date order and a
+    'YYYY-MM-DD' bound can be compared directly against full timestamps.
+    """
+
+    def __init__(self):
+        self.keys = []
+        self.doc_key = {}
+
+    def __len__(self):
+        return len(self.keys)
+
+    def add(self, doc_id, published):
+        self.remove(doc_id)
+        key = (published, doc_id)
+        bisect.insort(self.keys, key)
+        self.doc_key[doc_id] = key
+
+    def remove(self, doc_id):
+        key = self.doc_key.pop(doc_id, None)
+        if key is not None:
+            pos = bisect.bisect_left(self.keys, key)
+            del self.keys[pos]
+
+    def span(self, date_from=None, date_to=None):
+        """Slice bounds of keys within [date_from, date_to] (date_to inclusive)"""
+        lo = bisect.bisect_left(self.keys, (date_from,)) if date_from else 0
+        hi = bisect.bisect_right(self.keys, (date_to + '\uffff',)) if date_to else len(self.keys)
+        return lo, hi
+
+    def before(self, key=None, limit=50, accept=None):
+        """Up to limit keys strictly older than key (or the newest), newest first"""
+        end = bisect.bisect_left(self.keys, key) if key is not None else len(self.keys)
+        if accept is None:
+            return self.keys[max(0, end - limit):end][::-1]
+        keys = []
+        for pos in range(end - 1, -1, -1):
+            if accept(self.keys[pos][1]):
+                keys.append(self.keys[pos])
+                if len(keys) >= limit:
+                    break
+        return keys
+
+    def older_than(self, cutoff):
+        """Doc ids published strictly before cutoff"""
+        return [doc_id for _, doc_id in self.keys[:bisect.bisect_left(self.keys, (cutoff,))]]
+
+    def newest(self, date_from=None, date_to=None):
+        """Doc ids in the range, newest first"""
+        lo, hi = self.span(date_from, date_to)
+        for pos in range(hi - 1, lo - 1, -1):
+            yield self.keys[pos][1]
+
+
+class ScoreIndex:
+    """Doc ids kept sorted by a precomputed score, highest first"""
+
+    def __init__(self):
+        self.keys = []
+        self.doc_key = {}
+
+    def __len__(self):
+        return len(self.keys)
+
+    def add(self, doc_id, score):
+        self.remove(doc_id)
+        key = (-score, doc_id)
+        bisect.insort(self.keys, key)
+        self.doc_key[doc_id] = key
+
+    def remove(self, doc_id):
+        key = self.doc_key.pop(doc_id, None)
+        if key is not None:
+            del self.keys[bisect.bisect_left(self.keys, key)]
+
+    def top(self):
+        """Doc ids, best first"""
+        for _, doc_id in self.keys:
+            yield doc_id
+
+
+SIMHASH_BITS = 64
+SIMHASH_BANDS = 8  # 8-bit bands: pairs within 7 bits always share at least one
+SIMHASH_DISTANCE = 6  # Max differing bits for two docs to count as copies
+SHINGLE_SIZE = 3
+
+
+def simhash(text):
+    """64-bit SimHash over word shingles"""
+    tokens = tokenize(text)
+    if len(tokens) >= SHINGLE_SIZE:
+        shingles = {' '.join(tokens[i:i + SHINGLE_SIZE]) for i in range(len(tokens) - SHINGLE_SIZE + 1)}
+    else:
+        shingles = set(tokens)
+
+    weights = [0] * SIMHASH_BITS
+    for shingle in shingles:
+        h = int.from_bytes(hashlib.blake2b(shingle.encode(), digest_size=8).digest(), 'big')
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += 1 if h >> bit & 1 else -1
+
+    return sum(1 << bit for bit, w in enumerate(weights) if w > 0)
+
+
+class NearDuplicateIndex:
+    """
+    Clusters near-duplicate documents (syndicated copies) by SimHash
+
+    Fingerprints are split into bands and bucketed (LSH), so only docs
+    sharing a band are compared. A doc within max_distance bits of an
+    existing one joins its cluster; the first doc ingested into a cluster
+    is its representative. Cluster ids come from a counter and are never a
+    member's doc id, so re-adding a doc can't collide with a live cluster.
+    """
+
+    def __init__(self, max_distance=SIMHASH_DISTANCE):
+        self.max_distance = max_distance
+        self.band_bits = SIMHASH_BITS // SIMHASH_BANDS
+        self.buckets = {}
+        self.doc_hash = {}
+        self.doc_cluster = {}
+        self.clusters = {}
+        self.representatives = {}
+        self._next_cluster = 0
+
+    def _bands(self, h):
+        mask = (1 << self.band_bits) - 1
+        return [(band, h >> (band * self.band_bits) & mask) for band in range(SIMHASH_BANDS)]
+
+    def add(self, doc_id, text):
+        """
+        Fingerprint a document and assign it to a cluster
+
+        Returns:
+            Cluster id
+        """
+        h = simhash(text)
+        if self.doc_hash.get(doc_id) == h:
+            return self.doc_cluster[doc_id]
+        self.remove(doc_id)
+
+        cluster = None
+        for band in self._bands(h):
+            for other in self.buckets.get(band, ()):
+                if bin(h ^ self.doc_hash[other]).count('1') <= self.max_distance:
+                    cluster = self.doc_cluster[other]
+                    break
+            if cluster is not None:
+                break
+
+        if cluster is None:
+            cluster = self._next_cluster
+            self._next_cluster += 1
+            self.clusters[cluster] = set()
+            self.representatives[cluster] = doc_id
+
+        for band in self._bands(h):
+            self.buckets.setdefault(band, set()).add(doc_id)
+        self.doc_hash[doc_id] = h
+        self.doc_cluster[doc_id] = cluster
+        self.clusters[cluster].add(doc_id)
+        return cluster
+
+    def remove(self, doc_id):
+        h = self.doc_hash.pop(doc_id, None)
+        if h is None:
+            return
+        for band in self._bands(h):
+            bucket = self.buckets[band]
+            bucket.discard(doc_id)
+            if not bucket:
+                del self.buckets[band]
+
+        cluster = self.doc_cluster.pop(doc_id)
+        members = self.clusters[cluster]
+        members.discard(doc_id)
+        if not members:
+            del self.clusters[cluster]
+            del self.representatives[cluster]
+        elif self.representatives[cluster] == doc_id:
+            self.representatives[cluster] = min(members)
+
+    def is_representative(self, doc_id):
+        cluster = self.doc_cluster.get(doc_id)
+        return cluster is None or self.representatives[cluster] == doc_id
+
+    def size(self, doc_id):
+        """Number of copies in the doc's cluster"""
+        cluster = self.doc_cluster.get(doc_id)
+        return len(self.clusters[cluster]) if cluster is not None else 1
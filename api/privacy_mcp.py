@@ -1,41 +1,549 @@
 """
 Privacy Domain MCP Backend
 Aggregates privacy news, data breach alerts, policy tracking
+
+Development:
+    python3 privacy_mcp.py
+
+Production (from this directory):
+    gunicorn -c gunicorn.conf.py
 """
 
 import sys
 import os
+import html
+import hashlib
+import re
+import base64
+import fcntl
+import json
+import math
+import threading
+import time
+import xml.etree.ElementTree as ET
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+from email.utils import parsedate_to_datetime
 from pathlib import Path
 
-# Add feed_engine to path
+# Add feed_engine and this directory to path
 sys.path.insert(0, str(Path.home() / "Desktop" / "wavgroup" / "feed_engine"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
 
-from flask import Flask, request, jsonify
+from flask import Blueprint, Flask, Response, request, jsonify, stream_with_context
 import requests
-from datetime import datetime, timedelta
+from requests.adapters import HTTPAdapter
+from datetime import datetime, timedelta, timezone
 from aggregator import FeedAggregator
+from privacy_index import DateIndex, InvertedIndex, NearDuplicateIndex, ScoreIndex
+from privacy_metrics import Counter, Gauge, Histogram, Registry
+from privacy_policy import PolicyAnalyzer, PolicyTracker
+from privacy_schema import compile_schema
+from privacy_store import ItemStore
 
-app = Flask(__name__)
+bp = Blueprint('privacy_mcp', __name__)
+
+# Default seconds between polls of a source (overridable per source)
+REFRESH_INTERVAL = int(os.environ.get('PRIVACY_REFRESH_INTERVAL', 900))
+FETCH_TIMEOUT = 20  # Read timeout per source (overridable per source)
+CONNECT_TIMEOUT = 5
+FETCH_WORKERS = int(os.environ.get('PRIVACY_FETCH_WORKERS', 8))
 
 # Privacy news sources
 PRIVACY_SOURCES = [
-    {'name': 'EFF', 'type': 'rss', 'url': 'https://www.eff.org/rss/updates.xml'},
-    {'name': 'Techdirt', 'type': 'rss', 'url': 'https://www.techdirt.com/feed/'},
-    {'name': 'Ars Technica Privacy', 'type': 'rss', 'url': 'https://feeds.arstechnica.com/arstechnica/security'},
-    {'name': 'Privacy International', 'type': 'rss', 'url': 'https://privacyinternational.org/rss.xml'},
-    {'name': 'The Privacy Hub', 'type': 'rss', 'url': 'https://theprivacyhub.com/feed/'},
+    {'name': 'EFF', 'type': 'rss', 'url': 'https://www.eff.org/rss/updates.xml', 'interval': 1800, 'reputation': 1.0},
+    {'name': 'Techdirt', 'type': 'rss', 'url': 'https://www.techdirt.com/feed/', 'interval': 900, 'reputation': 0.8},
+    {'name': 'Ars Technica Privacy', 'type': 'rss', 'url': 'https://feeds.arstechnica.com/arstechnica/security', 'interval': 900, 'reputation': 1.0},
+    {'name': 'Privacy International', 'type': 'rss', 'url': 'https://privacyinternational.org/rss.xml', 'interval': 3600, 'reputation': 0.9},
+    {'name': 'The Privacy Hub', 'type': 'rss', 'url': 'https://theprivacyhub.com/feed/', 'interval': 3600, 'reputation': 0.7},
 ]
 
+# Durable item store; items published longer ago than the retention are pruned
+STORE_PATH = os.environ.get('PRIVACY_DB_PATH', str(Path(__file__).resolve().parent / 'privacy.db'))
+RETENTION_DAYS = int(os.environ.get('PRIVACY_RETENTION_DAYS', 90))
+COMPACT_INTERVAL = 24 * 3600
+
+# Only the process holding this lock polls upstream; other workers follow the store
+POLLER_LOCK_PATH = os.environ.get('PRIVACY_POLLER_LOCK', STORE_PATH + '.poller.lock')
+
+# Policy snapshots for privacy_track_domain (at most POLICY_MAX_DOMAINS), rechecked every POLICY_CHECK_INTERVAL
+POLICY_DIR = os.environ.get('PRIVACY_POLICY_DIR', str(Path(__file__).resolve().parent / 'policies'))
+POLICY_CHECK_INTERVAL = int(os.environ.get('PRIVACY_POLICY_INTERVAL', 24 * 3600))
+POLICY_MAX_DOMAINS = int(os.environ.get('PRIVACY_POLICY_MAX_DOMAINS', 500))
+SCHEDULER_POLL = int(os.environ.get('PRIVACY_SCHEDULER_POLL', 5))  # Max sleep, so work queued elsewhere is seen
+
+# Cached tools/call results (entries also die when a refresh ingests items)
+RESPONSE_CACHE_SIZE = int(os.environ.get('PRIVACY_CACHE_SIZE', 256))
+RESPONSE_CACHE_TTL = int(os.environ.get('PRIVACY_CACHE_TTL', 300))
+
+# Items read from the store per lock acquisition when streaming
+STREAM_BATCH = 100
+
+# JSON-RPC batches: max messages per POST and concurrent tool calls
+BATCH_LIMIT = 20
+BATCH_WORKERS = int(os.environ.get('PRIVACY_BATCH_WORKERS', 4))
+
+# Matched as one OR query by get_legislation_updates
+LEGISLATION_TERMS = ['GDPR', 'CCPA', 'privacy law', 'data protection']
+
+# Precomputed per item at ingest (item['breach'])
+BREACH_RE = re.compile(
+    r'\b(data breach|breach(es|ed)?|leak(s|ed)?|hack(s|ed)?|ransomware|compromised|exposed records)\b',
+    re.IGNORECASE
+)
+
+# Breach severity: keyword weights (each counted once per item), scaled by
+# source reputation and halved every BREACH_HALF_LIFE_DAYS of age
+BREACH_WEIGHTS = {
+    'ransomware': 3.0,
+    'data breach': 3.0,
+    'social security': 3.0,
+    'medical records': 2.5,
+    'health records': 2.5,
+    'credit card': 2.5,
+    'passwords': 2.0,
+    'breach': 2.0,
+    'leak': 1.5,
+    'leaked': 1.5,
+    'hacked': 1.5,
+    'exposed': 1.0,
+    'millions': 1.5,
+    'billion': 2.0,
+}
+BREACH_WEIGHT_RE = re.compile(r'\b(' + '|'.join(re.escape(k) for k in BREACH_WEIGHTS) + r')\b', re.IGNORECASE)
+BREACH_HALF_LIFE_DAYS = 7
+DEFAULT_REPUTATION = 0.8
+
+ATOM_NS = '{http://www.w3.org/2005/Atom}'
+CONTENT_NS = '{http://purl.org/rss/1.0/modules/content/}'
+
+
+def _strip_html(text):
+    """Reduce an HTML fragment to plain text"""
+    text = re.sub(r'<[^>]+>', ' ', text or '')
+    return re.sub(r'\s+', ' ', html.unescape(text)).strip()
+
+
+def _parse_date(value):
+    """Normalize RSS/Atom dates to naive UTC ISO strings (None if missing or unparsable)"""
+    value = (value or '').strip()
+    if not value:
+        return None
+    try:
+        dt = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        try:
+            dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt.strftime('%Y-%m-%dT%H:%M:%S')
+
+
+def parse_feed(body, source_name):
+    """
+    Parse an RSS 2.0 or Atom document into feed items
+
+    Args:
+        body: Raw feed bytes
+        source_name: Name of the source the feed came from
+
+    Returns:
+        List of item dicts (id, title, url, source, published, content, tags);
+        published is None when the entry has no usable date
+    """
+    root = ET.fromstring(body)
+    items = []
+
+    if root.tag == ATOM_NS + 'feed':
+        for entry in root.iter(ATOM_NS + 'entry'):
+            link = entry.find(ATOM_NS + 'link')
+            url = link.get('href', '') if link is not None else ''
+            items.append({
+                'guid': entry.findtext(ATOM_NS + 'id') or url,
+                'title': entry.findtext(ATOM_NS + 'title', ''),
+                'url': url,
+                'published': entry.findtext(ATOM_NS + 'published') or entry.findtext(ATOM_NS + 'updated'),
+                'content': entry.findtext(ATOM_NS + 'content') or entry.findtext(ATOM_NS + 'summary', ''),
+                'tags': [c.get('term', '') for c in entry.findall(ATOM_NS + 'category')],
+            })
+    else:
+        for entry in root.iter('item'):
+            url = entry.findtext('link', '')
+            items.append({
+                'guid': entry.findtext('guid') or url,
+                'title': entry.findtext('title', ''),
+                'url': url,
+                'published': entry.findtext('pubDate'),
+                'content': entry.findtext(CONTENT_NS + 'encoded') or entry.findtext('description', ''),
+                'tags': [c.text or '' for c in entry.findall('category')],
+            })
+
+    return [{
+        'id': hashlib.sha1(f"{source_name}:{raw['guid']}".encode()).hexdigest()[:16],
+        'title': _strip_html(raw['title']),
+        'url': raw['url'].strip(),
+        'source': source_name,
+        'published': _parse_date(raw['published']),
+        'content': _strip_html(raw['content']),
+        'tags': sorted({t.strip().lower() for t in raw['tags'] if t.strip()}),
+    } for raw in items]
+
+
+def is_breach(item):
+    """Classify an item as breach news from its tags, title and content"""
+    return 'breach' in item['tags'] or bool(BREACH_RE.search(f"{item['title']} {item['content']}"))
+
+
+def breach_severity(item, reputation=DEFAULT_REPUTATION):
+    """Keyword-weighted severity of a breach item, before recency decay"""
+    terms = {m.lower() for m in BREACH_WEIGHT_RE.findall(f"{item['title']} {item['content']}")}
+    return round((1.0 + sum(BREACH_WEIGHTS[t] for t in terms)) * reputation, 3)
+
+
+def breach_rank(severity, published):
+    """
+    Time-invariant ranking key for severity * recency decay
+
+    severity * 0.5 ** (age / half_life) orders the same as
+    log(severity) + published * ln2 / half_life at any "now", so the key
+    can be computed once at ingest and kept in a sorted index.
+    """
+    published_ts = datetime.fromisoformat(published).replace(tzinfo=timezone.utc).timestamp()
+    return math.log(severity) + published_ts * math.log(2) / (BREACH_HALF_LIFE_DAYS * 86400)
+
 
 class PrivacyAggregator(FeedAggregator):
     """Extended aggregator with privacy-specific functionality"""
 
-    def get_data_breaches(self, days=30):
+    def __init__(self, name, *args, store=None, retention_days=RETENTION_DAYS,
+                 policy_tracker=None, policy_analyzer=None, **kwargs):
+        super().__init__(name, *args, **kwargs)
+        self.store = store
+        self.policy_tracker = policy_tracker
+        self.policy_analyzer = policy_analyzer
+        self.retention_days = retention_days
+        self.last_compact = time.time()
+        self.items = {}
+        self.index = InvertedIndex()
+        self.by_date = DateIndex()
+        self.breach_rank = ScoreIndex()
+        self.dupes = NearDuplicateIndex()
+        self.source_state = {}
+        self.generation = 0  # Bumped whenever ingest changes the store
+        self.synced_at = 0.0  # Store watermark already ingested
+        self._lock = threading.RLock()
+        self._init_fetch_pool()
+        # Sockets and pool threads don't survive fork(); gunicorn workers rebuild them
+        os.register_at_fork(after_in_child=self._init_fetch_pool)
+
+    def _init_fetch_pool(self):
+        """Shared keep-alive session and thread pool, so sources are fetched in parallel"""
+        self._lock = threading.RLock()
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = 'Death2Data-PrivacyMCP/1.0'
+        adapter = HTTPAdapter(pool_connections=FETCH_WORKERS, pool_maxsize=FETCH_WORKERS)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self._pool = ThreadPoolExecutor(max_workers=FETCH_WORKERS, thread_name_prefix='privacy-fetch')
+        # A fetch still running in the parent at fork time has no thread here
+        # to finish it, so its source would otherwise stay pending forever
+        for state in self.source_state.values():
+            state['in_flight'] = False
+
+    def add_source(self, name, source_type, url, interval=None, timeout=None, reputation=None):
+        """Register a source along with its polling state"""
+        super().add_source(name, source_type, url)
+        self.source_state[name] = {
+            'name': name,
+            'type': source_type,
+            'url': url,
+            'interval': interval or REFRESH_INTERVAL,
+            'timeout': timeout or FETCH_TIMEOUT,
+            'reputation': reputation or DEFAULT_REPUTATION,
+            'in_flight': False,
+            'etag': None,
+            'last_modified': None,
+            'next_due': 0.0,
+            'last_checked': None,
+            'last_success': None,
+            'last_status': None,
+            'last_error': None,
+            'errors': 0,
+        }
+        saved = self.store.load_source(name) if self.store else None
+        if saved:
+            saved.pop('next_due', None)  # Every source is due on start
+            self.source_state[name].update(saved)
+
+    def load_store(self):
+        """
+        Serve the last known feed right away on restart
+
+        Call after the sources are registered: breach severity depends on
+        each source's reputation.
+        """
+        if self.store:
+            items, self.synced_at = self.store.changed_since(0.0)
+            self.ingest(items, persist=False)
+
+    def sync_from_store(self):
+        """
+        Catch up with the polling process through the store
+
+        Ingests items written since the last sync, drops expired ones and
+        picks up each source's polling state.
+
+        Returns:
+            Number of items ingested
+        """
+        if not self.store:
+            return 0
+        items, self.synced_at = self.store.changed_since(self.synced_at)
+        self.ingest(items, persist=False)
+        self.prune(persist=False)
+        for name, state in self.source_state.items():
+            saved = self.store.load_source(name)
+            if saved:
+                state.update(saved)
+        return len(items)
+
+    def fetch_source(self, name, force=False):
+        """
+        Fetch a single source with a conditional GET
+
+        Args:
+            name: Source name
+            force: Ignore the stored ETag/Last-Modified validators
+
+        Returns:
+            Stats dict for this source (fetched, new, status)
+        """
+        state = self.source_state[name]
+        headers = {}
+        if not force:
+            if state['etag']:
+                headers['If-None-Match'] = state['etag']
+            if state['last_modified']:
+                headers['If-Modified-Since'] = state['last_modified']
+
+        stats = {'fetched': 0, 'new': 0, 'status': None}
+        state['last_checked'] = time.time()
+        try:
+            resp = self.session.get(state['url'], headers=headers,
+                                    timeout=(CONNECT_TIMEOUT, state['timeout']))
+            stats['status'] = resp.status_code
+
+            if resp.status_code == 304:
+                state['last_success'] = state['last_checked']
+            else:
+                resp.raise_for_status()
+                items = parse_feed(resp.content, name)
+                stats['fetched'] = len(items)
+                stats['new'] = self.ingest(items)
+                state['etag'] = resp.headers.get('ETag')
+                state['last_modified'] = resp.headers.get('Last-Modified')
+                state['last_success'] = state['last_checked']
+
+            state['last_error'] = None
+            state['errors'] = 0
+            SOURCE_FETCHES.inc(name, str(resp.status_code))
+        except Exception as e:
+            state['last_error'] = str(e)
+            state['errors'] += 1
+            SOURCE_FETCHES.inc(name, 'error')
+            SOURCE_ERRORS.inc(name)
+            print(f"Error fetching {name}: {e}")
+        finally:
+            state['in_flight'] = False
+            SOURCE_FETCH_SECONDS.observe(time.time() - state['last_checked'], name)
+
+        state['last_status'] = stats['status']
+        # Back off failing sources, capped at six intervals
+        backoff = min(2 ** state['errors'], 6) if state['errors'] else 1
+        state['next_due'] = state['last_checked'] + state['interval'] * backoff
+        if self.store:
+            self.store.save_source(name, state)
+        return stats
+
+    def ingest(self, items, persist=True):
         """
-        Get recent data breach notifications
+        Add parsed items to the indexes and (if persist) the item store
+
+        Returns:
+            Number of items not seen before
+        """
+        new = 0
+        now = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S')
+        with self._lock:
+            for item in items:
+                known = self.items.get(item['id'])
+                if known is None:
+                    new += 1
+                if not item['published']:
+                    # Undated entries keep the date they were first seen, not each refetch's
+                    item['published'] = known['published'] if known else now
+                item['breach'] = is_breach(item)
+                self.items[item['id']] = item
+                self.index.add(item['id'], item['title'], item['content'])
+                self.by_date.add(item['id'], item['published'])
+                item['cluster'] = self.dupes.add(item['id'], f"{item['title']} {item['content']}")
+                if item['breach']:
+                    reputation = self.source_state.get(item['source'], {}).get('reputation', DEFAULT_REPUTATION)
+                    item['severity'] = breach_severity(item, reputation)
+                    self.breach_rank.add(item['id'], breach_rank(item['severity'], item['published']))
+                else:
+                    item['severity'] = 0.0
+                    self.breach_rank.remove(item['id'])
+            if items:
+                self.generation += 1
+        if persist and self.store and items:
+            self.store.upsert(items)
+        return new
+
+    def _unindex(self, doc_id):
+        self.items.pop(doc_id, None)
+        self.index.remove(doc_id)
+        self.by_date.remove(doc_id)
+        self.dupes.remove(doc_id)
+        self.breach_rank.remove(doc_id)
+
+    def prune(self, persist=True):
+        """
+        Drop items older than the retention window, compacting the store daily
+
+        Args:
+            persist: Also delete them from the store (only the polling process does)
+
+        Returns:
+            Number of items pruned
+        """
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=self.retention_days)).strftime('%Y-%m-%d')
+        with self._lock:
+            expired = self.by_date.older_than(cutoff)
+            for doc_id in expired:
+                self._unindex(doc_id)
+            if expired:
+                self.generation += 1
+
+        if persist and self.store:
+            self.store.prune(cutoff)
+            if time.time() - self.last_compact > COMPACT_INTERVAL:
+                self.store.compact()
+                self.last_compact = time.time()
+        return len(expired)
+
+    def aggregate(self, force=False, sources=None):
+        """
+        Fetch sources concurrently and ingest their items
+
+        Every source is fetched at once on the shared pool, so a refresh
+        takes about as long as the slowest source. A source that is still
+        running when its deadline passes is left to finish in the
+        background and reported as pending; the others are returned.
+
+        Args:
+            force: Skip conditional requests and refetch everything
+            sources: Source names to fetch (default: all)
+
+        Returns:
+            Stats dict (fetched, new, pending)
+        """
+        totals = {'fetched': 0, 'new': 0, 'pending': []}
+        futures = {}
+        for name in sources or list(self.source_state):
+            state = self.source_state[name]
+            if state['in_flight']:
+                totals['pending'].append(name)
+                continue
+            state['in_flight'] = True
+            futures[self._pool.submit(self.fetch_source, name, force)] = name
+
+        if futures:
+            deadline = CONNECT_TIMEOUT + max(self.source_state[n]['timeout'] for n in futures.values())
+            done, not_done = wait(futures, timeout=deadline)
+            for future in done:
+                stats = future.result()
+                totals['fetched'] += stats['fetched']
+                totals['new'] += stats['new']
+            # Late fetches are counted by fetch_source when they finish
+            totals['pending'].extend(futures[f] for f in not_done)
+
+        return totals
+
+    def get_feed(self, limit=50, offset=0):
+        """Newest items first, one per near-duplicate cluster"""
+        with self._lock:
+            keys = self.by_date.before(None, offset + limit, accept=self.dupes.is_representative)
+            return [self.items[doc_id] for _, doc_id in keys[offset:]]
+
+    def get_feed_page(self, limit=50, cursor=None):
+        """
+        Keyset page of the feed, newest first, one per near-duplicate cluster
+
+        Args:
+            limit: Maximum items
+            cursor: (published, id) key of the last item already seen
+
+        Returns:
+            (items, key of the last item or None when exhausted)
+        """
+        with self._lock:
+            keys = self.by_date.before(cursor, limit, accept=self.dupes.is_representative)
+            items = [self.items[doc_id] for _, doc_id in keys]
+        return items, (keys[-1] if len(keys) == limit else None)
+
+    def iter_feed(self, limit=50, offset=0, cursor=None, batch=STREAM_BATCH):
+        """
+        Lazily yield feed items, newest first
+
+        Items are read in small keyset pages, taking the lock once per page,
+        so memory stays flat however large the limit is and refreshes can
+        land in between.
+        """
+        if cursor is None and offset:
+            with self._lock:
+                skipped = self.by_date.before(None, offset, accept=self.dupes.is_representative)
+            cursor = skipped[-1] if len(skipped) == offset else ('',)
+
+        remaining = limit
+        while remaining > 0:
+            items, cursor = self.get_feed_page(min(batch, remaining), cursor)
+            yield from items
+            remaining -= len(items)
+            if cursor is None:
+                return
+
+    def search(self, keyword, limit=50):
+        """BM25-ranked full-text search"""
+        return self.search_any([keyword], limit=limit)
+
+    def search_any(self, queries, limit=50):
+        """
+        Rank items matching any of several keywords/phrases in one pass
+
+        Only cluster representatives are returned, so syndicated copies of
+        a story appear once.
+
+        Args:
+            queries: List of keywords or phrases
+            limit: Maximum results
+
+        Returns:
+            List of items, best match first
+        """
+        with self._lock:
+            hits = self.index.search(queries, limit=limit, accept=self.dupes.is_representative)
+            return [self.items[doc_id] for _, doc_id in hits]
+
+    def get_data_breaches(self, days=30, limit=100):
+        """
+        Get recent data breach notifications, most severe first
 
         Args:
             days: Number of days to look back
+            limit: Maximum breaches
 
         Returns:
             List of data breaches
@@ -45,20 +553,17 @@ class PrivacyAggregator(FeedAggregator):
             # Note: This would integrate with HaveIBeenPwned API
             # Requires API key from https://haveibeenpwned.com/API/Key
 
-            # For now, filter breach-related content from feeds
+            # For now, use breach-classified content from feeds, walking the
+            # precomputed severity/recency ranking
             from_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
 
-            results = self.filter({
-                'tags': 'breach',
-                'date_from': from_date
-            }, limit=50)
-
-            # Also search for breach-related content
-            breach_results = self.search('breach', limit=50)
-
-            # Combine and deduplicate
-            all_results = {item['id']: item for item in results + breach_results}
-            items = list(all_results.values())
+            with self._lock:
+                for doc_id in self.breach_rank.top():
+                    item = self.items[doc_id]
+                    if item['published'] >= from_date and self.dupes.is_representative(doc_id):
+                        items.append(item)
+                        if len(items) >= limit:
+                            break
 
         except Exception as e:
             print(f"Error fetching data breaches: {e}")
@@ -69,18 +574,38 @@ class PrivacyAggregator(FeedAggregator):
         """
         Track privacy policy changes for a domain
 
+        The first call only queues the domain; the refresh scheduler takes
+        the first snapshot, then rechecks the policy and records a diff
+        whenever it changes.
+
         Args:
             domain: Domain to track
 
         Returns:
             Policy tracking info
         """
-        # This would integrate with the Death2Data platform
-        # For now, return placeholder
+        record = self.policy_tracker.track(domain)
+        snapshots = record['snapshots']
+        changes = [s for s in snapshots if s['diff']]
+
+        if not snapshots:
+            status = 'error' if record['last_error'] else 'pending'
+        elif not changes:
+            status = 'tracked'
+        elif changes[-1] is snapshots[-1]:
+            status = 'changed'
+        else:
+            status = 'unchanged'
+
         return {
-            'domain': domain,
-            'status': 'tracked',
-            'note': 'Requires Death2Data platform integration',
+            'domain': record['domain'],
+            'status': status,
+            'url': record['url'],
+            'snapshots': len(snapshots),
+            'last_checked': record['last_checked'],
+            'last_changed': record['last_changed'],
+            'last_diff': changes[-1]['diff'] if changes else None,
+            'error': record['last_error'],
             'related_domains': [
                 'deathtodata.com',
                 'deathtobigtech.com',
@@ -96,40 +621,234 @@ class PrivacyAggregator(FeedAggregator):
             url: Privacy policy URL
 
         Returns:
-            Analysis results
+            Analysis results (scores per category, risk level, findings)
         """
-        # This would use the existing qr-generator and privacy tools
-        return {
-            'url': url,
-            'status': 'analyzed',
-            'note': 'Requires integration with Death2Data privacy analysis tools',
-            'tools_available': [
-                'QR Code Generator',
-                'Privacy Policy Analyzer',
-                'Cookie Tracker'
-            ]
-        }
+        return self.policy_analyzer.analyze_url(url)
+
+    def analyze_privacy_policies(self, urls):
+        """Analyze several privacy policy URLs concurrently, in input order"""
+        return self.policy_analyzer.analyze_urls(urls)
 
     def get_legislation_updates(self):
         """Get privacy legislation updates (GDPR, CCPA, etc.)"""
-        items = []
+        return self.search_any(LEGISLATION_TERMS, limit=40)
+
+
+class RefreshScheduler:
+    """
+    Background thread that polls each source when its interval elapses
+
+    Under gunicorn every worker runs one, but only the process holding the
+    poller lock fetches upstream, prunes the store and rechecks policies.
+    The others follow the store instead, and pass refresh requests to the
+    poller through it. If the poller dies its lock is released and the
+    next follower to try takes over.
+    """
+
+    def __init__(self, aggregator, lock_path=None):
+        self.aggregator = aggregator
+        self.lock_path = lock_path
+        self.running = False
+        self.last_run = None
+        self._force = False
+        self._wake = threading.Event()
+        self._thread = None
+        self._lock_file = None
 
-        # Search for legislation keywords
-        keywords = ['GDPR', 'CCPA', 'privacy law', 'data protection']
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._loop, name='privacy-refresh', daemon=True)
+        self._thread.start()
 
-        for keyword in keywords:
-            results = self.search(keyword, limit=10)
-            items.extend(results)
+    @property
+    def is_poller(self):
+        """Whether this process polls upstream (takes the lock if it is free)"""
+        if self._lock_file is None:
+            if not self.lock_path:
+                return True
+            lock_file = open(self.lock_path, 'a')
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                lock_file.close()
+                return False
+            self._lock_file = lock_file
+            print(f"Process {os.getpid()} is polling privacy sources")
+        return True
 
-        # Deduplicate
-        unique_items = {item['id']: item for item in items}
-        return list(unique_items.values())
+    def trigger(self, force=False):
+        """Mark every source due and wake the refresh thread"""
+        store = self.aggregator.store
+        if self._lock_file is None and self.lock_path and store:
+            # Possibly a follower; the poller picks this up within SCHEDULER_POLL
+            store.request_refresh(force)
+        for state in self.aggregator.source_state.values():
+            state['next_due'] = 0.0
+        self._force = self._force or force
+        self._wake.set()
+
+    def wake(self):
+        """Wake the refresh thread to pick up newly queued work"""
+        self._wake.set()
+
+    def _due_sources(self, now):
+        return [name for name, state in self.aggregator.source_state.items()
+                if state['next_due'] <= now]
+
+    def _loop(self):
+        while True:
+            if self.is_poller:
+                self._poll()
+            else:
+                self.aggregator.sync_from_store()
+            self._wake.wait(timeout=self._sleep())
+            self._wake.clear()
+
+    def _poll(self):
+        store = self.aggregator.store
+        requested = store.take_refresh_request() if store else None
+        if requested is not None:
+            for state in self.aggregator.source_state.values():
+                state['next_due'] = 0.0
+            self._force = self._force or requested
+
+        due = self._due_sources(time.time())
+        if due:
+            force, self._force = self._force, False
+            self.running = True
+            try:
+                stats = self.aggregator.aggregate(force=force, sources=due)
+                stats['pruned'] = self.aggregator.prune()
+                self.last_run = {'at': time.time(), 'sources': due, **stats}
+            finally:
+                self.running = False
+
+        tracker = self.aggregator.policy_tracker
+        if tracker:
+            changed = tracker.check_due()
+            if changed:
+                print(f"Privacy policy changed: {', '.join(changed)}")
+
+    def _sleep(self):
+        if self._lock_file is None and self.lock_path:
+            return SCHEDULER_POLL
+        next_due = min((s['next_due'] for s in self.aggregator.source_state.values()), default=time.time() + REFRESH_INTERVAL)
+        tracker = self.aggregator.policy_tracker
+        if tracker and tracker.next_due() is not None:
+            next_due = min(next_due, tracker.next_due())
+        return min(SCHEDULER_POLL, max(1.0, next_due - time.time()))
+
+    def status(self):
+        """Per-source refresh state"""
+        now = time.time()
+        return {
+            'poller': self._lock_file is not None or not self.lock_path,
+            'running': self.running,
+            'last_run': self.last_run,
+            'sources': [{
+                'name': state['name'],
+                'last_status': state['last_status'],
+                'last_success_age': round(now - state['last_success']) if state['last_success'] else None,
+                'next_in': max(0, round(state['next_due'] - now)),
+                'error': state['last_error'],
+            } for state in self.aggregator.source_state.values()]
+        }
+
+
+class ResponseCache:
+    """
+    LRU + TTL cache for tool results
+
+    Entries remember the aggregator generation they were built from; a
+    lookup against a newer generation is a miss, so a refresh invalidates
+    everything without walking the cache.
+    """
+
+    def __init__(self, max_size=RESPONSE_CACHE_SIZE, ttl=RESPONSE_CACHE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(tool_name, arguments):
+        return (tool_name, json.dumps(arguments, sort_keys=True, default=str))
+
+    def get(self, key, generation):
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None or entry[0] != generation or entry[1] < time.time():
+                if entry is not None:
+                    del self.entries[key]
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def put(self, key, value, generation):
+        with self._lock:
+            self.entries[key] = (generation, time.time() + self.ttl, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
 
 
 # Create privacy aggregator
-privacy_agg = PrivacyAggregator('privacy')
+privacy_agg = PrivacyAggregator('privacy', store=ItemStore(STORE_PATH),
+                                policy_tracker=PolicyTracker(POLICY_DIR, interval=POLICY_CHECK_INTERVAL,
+                                                             max_domains=POLICY_MAX_DOMAINS),
+                                policy_analyzer=PolicyAnalyzer())
 for source in PRIVACY_SOURCES:
-    privacy_agg.add_source(source['name'], source['type'], source['url'])
+    privacy_agg.add_source(source['name'], source['type'], source['url'],
+                           interval=source.get('interval'), timeout=source.get('timeout'),
+                           reputation=source.get('reputation'))
+privacy_agg.load_store()
+
+refresher = RefreshScheduler(privacy_agg, lock_path=None if STORE_PATH == ':memory:' else POLLER_LOCK_PATH)
+response_cache = ResponseCache()
+batch_pool = ThreadPoolExecutor(max_workers=BATCH_WORKERS, thread_name_prefix='privacy-batch')
+
+
+def _source_ages():
+    now = time.time()
+    return {(name,): round(now - state['last_success'], 1)
+            for name, state in privacy_agg.source_state.items() if state['last_success']}
+
+
+def _cache_hit_ratio():
+    lookups = response_cache.hits + response_cache.misses
+    return {(): round(response_cache.hits / lookups, 4) if lookups else 0}
+
+
+# Metrics (served at /metrics)
+metrics = Registry()
+TOOL_REQUESTS = metrics.register(Counter(
+    'privacy_mcp_tool_requests_total', 'MCP tool calls by tool and HTTP status', ('tool', 'status')))
+TOOL_SECONDS = metrics.register(Histogram(
+    'privacy_mcp_tool_latency_seconds', 'MCP tool call latency', ('tool',)))
+SOURCE_FETCHES = metrics.register(Counter(
+    'privacy_source_fetches_total', 'Source fetches by outcome (HTTP status or error)', ('source', 'status')))
+SOURCE_ERRORS = metrics.register(Counter(
+    'privacy_source_fetch_errors_total', 'Failed source fetches', ('source',)))
+SOURCE_FETCH_SECONDS = metrics.register(Histogram(
+    'privacy_source_fetch_seconds', 'Source fetch duration including parse and ingest', ('source',)))
+metrics.register(Gauge(
+    'privacy_source_last_success_age_seconds', 'Seconds since the source last refreshed', _source_ages, ('source',)))
+metrics.register(Gauge(
+    'privacy_cache_hits_total', 'Response cache hits', lambda: {(): response_cache.hits}, metric_type='counter'))
+metrics.register(Gauge(
+    'privacy_cache_misses_total', 'Response cache misses', lambda: {(): response_cache.misses}, metric_type='counter'))
+metrics.register(Gauge(
+    'privacy_cache_hit_ratio', 'Response cache hits / lookups', _cache_hit_ratio))
+metrics.register(Gauge(
+    'privacy_store_items', 'Items held in memory', lambda: {(): len(privacy_agg.items)}))
+metrics.register(Gauge(
+    'privacy_store_bytes', 'Item store size on disk',
+    lambda: {(): privacy_agg.store.size_bytes() if privacy_agg.store else 0}))
 
 
 # MCP Tool Definitions
@@ -141,14 +860,28 @@ TOOLS = [
             "type": "object",
             "properties": {
                 "limit": {
-                    "type": "number",
+                    "type": "integer",
                     "description": "Maximum number of items to return",
-                    "default": 50
+                    "default": 50,
+                    "minimum": 1,
+                    "maximum": 500
+                },
+                "cursor": {
+                    "type": "string",
+                    "description": "next_cursor from the previous page (preferred over offset)",
+                    "maxLength": 200
                 },
                 "offset": {
-                    "type": "number",
-                    "description": "Offset for pagination",
-                    "default": 0
+                    "type": "integer",
+                    "description": "Offset for pagination (deprecated, use cursor)",
+                    "default": 0,
+                    "minimum": 0,
+                    "maximum": 5000
+                },
+                "stream": {
+                    "type": "boolean",
+                    "description": "Stream items as server-sent events",
+                    "default": False
                 }
             }
         }
@@ -161,12 +894,16 @@ TOOLS = [
             "properties": {
                 "query": {
                     "type": "string",
-                    "description": "Search query"
+                    "description": "Search query",
+                    "minLength": 1,
+                    "maxLength": 200
                 },
                 "limit": {
-                    "type": "number",
+                    "type": "integer",
                     "description": "Maximum results",
-                    "default": 50
+                    "default": 50,
+                    "minimum": 1,
+                    "maximum": 100
                 }
             },
             "required": ["query"]
@@ -179,9 +916,11 @@ TOOLS = [
             "type": "object",
             "properties": {
                 "days": {
-                    "type": "number",
+                    "type": "integer",
                     "description": "Number of days to look back",
-                    "default": 30
+                    "default": 30,
+                    "minimum": 1,
+                    "maximum": 365
                 }
             }
         }
@@ -194,7 +933,9 @@ TOOLS = [
             "properties": {
                 "domain": {
                     "type": "string",
-                    "description": "Domain to track (e.g., facebook.com)"
+                    "description": "Domain to track (e.g., facebook.com)",
+                    "minLength": 1,
+                    "maxLength": 253
                 }
             },
             "required": ["domain"]
@@ -202,16 +943,23 @@ TOOLS = [
     },
     {
         "name": "privacy_analyze_policy",
-        "description": "Analyze a privacy policy URL",
+        "description": "Score data collection, sharing and retention clauses in privacy policies",
         "inputSchema": {
             "type": "object",
             "properties": {
                 "url": {
                     "type": "string",
-                    "description": "Privacy policy URL to analyze"
+                    "description": "Privacy policy URL to analyze",
+                    "minLength": 1,
+                    "maxLength": 2048
+                },
+                "urls": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Several policy URLs to analyze in one call",
+                    "maxItems": 20
                 }
-            },
-            "required": ["url"]
+            }
         }
     },
     {
@@ -224,7 +972,7 @@ TOOLS = [
     },
     {
         "name": "privacy_aggregate",
-        "description": "Manually trigger feed aggregation",
+        "description": "Queue a feed refresh and report per-source refresh state",
         "inputSchema": {
             "type": "object",
             "properties": {
@@ -238,141 +986,403 @@ TOOLS = [
     }
 ]
 
+# Read-only tools whose results depend only on arguments and the item store
+CACHEABLE_TOOLS = {'privacy_feed', 'privacy_search', 'privacy_breaches', 'privacy_legislation'}
+
+TOOL_HANDLERS = {}
+
+
+def tool(name):
+    """Register a tool handler: handler(validated_arguments) -> result dict"""
+    def register(handler):
+        TOOL_HANDLERS[name] = handler
+        return handler
+    return register
+
+
+class Tool:
+    """A registered tool: its TOOLS spec, compiled validator and handler"""
+
+    def __init__(self, spec, handler):
+        self.name = spec['name']
+        self.spec = spec
+        self.validate = compile_schema(spec['inputSchema'])
+        self.handler = handler
+        self.cacheable = self.name in CACHEABLE_TOOLS
+
+
+def encode_cursor(key):
+    """Opaque cursor for a (published, id) feed key"""
+    return base64.urlsafe_b64encode(json.dumps(list(key)).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Inverse of encode_cursor; raises ValueError for anything malformed"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        published, doc_id = json.loads(base64.urlsafe_b64decode(padded))
+        return (str(published), str(doc_id))
+    except Exception:
+        raise ValueError(f"Invalid cursor: {cursor}")
+
+
+def format_feed_item(item):
+    """Markdown entry for one privacy_feed item"""
+    return f"**{item['title']}**\n{item['source']} | {item['published']}\n{item['url']}\n{item['content'][:200]}..."
+
+
+def wants_stream(arguments):
+    """Stream when asked explicitly or when the client only takes SSE"""
+    return bool(arguments.get('stream')) or request.accept_mimetypes.best == 'text/event-stream'
+
+
+def stream_feed(arguments):
+    """
+    privacy_feed as server-sent events
+
+    Each item is sent as its own text content block as soon as it is read
+    from the store, followed by an 'end' event with the item count.
+    """
+    limit = arguments.get('limit', 50)
+    offset = arguments.get('offset', 0)
+    cursor = decode_cursor(arguments['cursor']) if arguments.get('cursor') else None
+
+    def events():
+        count = 0
+        for item in privacy_agg.iter_feed(limit=limit, offset=offset, cursor=cursor):
+            count += 1
+            yield f"event: content\ndata: {json.dumps({'type': 'text', 'text': format_feed_item(item)})}\n\n"
+        yield f"event: end\ndata: {json.dumps({'count': count})}\n\n"
+
+    return Response(stream_with_context(events()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
+@tool('privacy_feed')
+def privacy_feed_tool(arguments):
+    """Newest items, paged by cursor (or deprecated offset)"""
+    limit = arguments.get('limit', 50)
+    offset = arguments.get('offset', 0)
+    if arguments.get('cursor') or not offset:
+        cursor = decode_cursor(arguments['cursor']) if arguments.get('cursor') else None
+        items, next_key = privacy_agg.get_feed_page(limit=limit, cursor=cursor)
+    else:
+        items = privacy_agg.get_feed(limit=limit, offset=offset)
+        next_key = (items[-1]['published'], items[-1]['id']) if len(items) == limit else None
+    next_cursor = encode_cursor(next_key) if next_key else None
+
+    return {
+        "content": [{
+            "type": "text",
+            "text": f"Found {len(items)} privacy news items:\n\n" +
+                   "\n\n".join([format_feed_item(item) for item in items]) +
+                   (f"\n\nMore items available. next_cursor: {next_cursor}" if next_cursor else "")
+        }],
+        "next_cursor": next_cursor
+    }
+
+
+@tool('privacy_search')
+def privacy_search_tool(arguments):
+    """Full-text search across sources"""
+    query = arguments.get('query')
+    limit = arguments.get('limit', 50)
+    results = privacy_agg.search(query, limit=limit)
+
+    return {
+        "content": [{
+            "type": "text",
+            "text": f"Found {len(results)} results for '{query}':\n\n" +
+                   "\n\n".join([
+                       f"**{item['title']}**\n{item['source']} | {item['published']}\n{item['url']}"
+                       for item in results
+                   ])
+        }]
+    }
 
-@app.route('/mcp', methods=['POST'])
-def mcp_handler():
-    """MCP protocol handler"""
-    data = request.get_json()
 
+@tool('privacy_breaches')
+def privacy_breaches_tool(arguments):
+    """Recent breach items, most severe first"""
+    days = arguments.get('days', 30)
+    breaches = privacy_agg.get_data_breaches(days=days)
+
+    return {
+        "content": [{
+            "type": "text",
+            "text": f"Data Breaches (last {days} days):\n\n" +
+                   "\n\n".join([
+                       f"**{item['title']}**\n{item['source']} | {item['published']} | severity {item['severity']}\n{item['url']}"
+                       for item in breaches
+                   ]) if breaches else "No recent data breach notifications found."
+        }]
+    }
+
+
+@tool('privacy_track_domain')
+def privacy_track_domain_tool(arguments):
+    """Privacy policy tracking for a domain"""
+    domain = arguments.get('domain')
+    result = privacy_agg.track_privacy_policy(domain)
+    if result['status'] == 'pending':
+        refresher.wake()
+    diff = result['last_diff']
+
+    def when(ts):
+        return datetime.fromtimestamp(ts, timezone.utc).strftime('%Y-%m-%d %H:%M UTC') if ts else 'never'
+
+    return {
+        "content": [{
+            "type": "text",
+            "text": f"Privacy Policy Tracking: {result['domain']}\n\n" +
+                   f"Status: {result['status']}\n" +
+                   f"Policy URL: {result['url'] or 'not found'}\n" +
+                   f"Snapshots: {result['snapshots']}\n" +
+                   f"Last checked: {when(result['last_checked'])}\n" +
+                   f"Last changed: {when(result['last_changed'])}\n" +
+                   (f"Error: {result['error']}\n" if result['error'] else "") +
+                   (f"\nLast change: +{diff['added_lines']} / -{diff['removed_lines']} lines\n" +
+                    "".join([f"- Changed: {s}\n" for s in diff['sections_changed']]) +
+                    "".join([f"- Added: {s}\n" for s in diff['sections_added']]) +
+                    "".join([f"- Removed: {s}\n" for s in diff['sections_removed']]) if diff else "") +
+                   f"\nRelated Death2Data domains:\n" +
+                   "\n".join([f"- {d}" for d in result['related_domains']])
+        }]
+    }
+
+
+@tool('privacy_analyze_policy')
+def privacy_analyze_policy_tool(arguments):
+    """Privacy policy analysis for one or more URLs"""
+    urls = ([arguments['url']] if arguments.get('url') else []) + arguments.get('urls', [])
+    if not urls:
+        raise ValueError("Provide url or urls")
+    results = privacy_agg.analyze_privacy_policies(urls)
+
+    def render(result):
+        if result['status'] != 'analyzed':
+            return f"Privacy Policy Analysis: {result['url']}\n\nStatus: error\nError: {result['error']}"
+        return (f"Privacy Policy Analysis: {result['url']}\n\n" +
+                f"Status: analyzed{' (cached)' if result['cached'] else ''}\n" +
+                f"Risk: {result['risk']}\n" +
+                f"Sections: {result['sections']}\n" +
+                "Scores: " + ", ".join([f"{c} {v:+d}" for c, v in result['scores'].items()]) + "\n\n" +
+                "Findings:\n" +
+                "\n".join([f"- [{f['category']} {f['weight']:+d}] {f['section']}: \"{f['phrase']}\""
+                           for f in result['findings']]))
+
+    return {
+        "content": [{
+            "type": "text",
+            "text": "\n\n---\n\n".join([render(r) for r in results])
+        }]
+    }
+
+
+@tool('privacy_legislation')
+def privacy_legislation_tool(arguments):
+    """GDPR/CCPA/etc. legislation news"""
+    updates = privacy_agg.get_legislation_updates()
+
+    return {
+        "content": [{
+            "type": "text",
+            "text": "Privacy Legislation Updates:\n\n" +
+                   "\n\n".join([
+                       f"**{item['title']}**\n{item['source']} | {item['published']}\n{item['url']}"
+                       for item in updates[:20]
+                   ]) if updates else "No recent legislation updates found."
+        }]
+    }
+
+
+@tool('privacy_aggregate')
+def privacy_aggregate_tool(arguments):
+    """Queue a refresh and report per-source state"""
+    force = arguments.get('force', False)
+    refresher.trigger(force=force)
+    status = refresher.status()
+
+    return {
+        "content": [{
+            "type": "text",
+            "text": f"Refresh queued{' (forced)' if force else ''}. " +
+                   f"Items in store: {len(privacy_agg.items)}\n\n" +
+                   "\n".join([
+                       f"- {s['name']}: last HTTP {s['last_status'] or '-'}, " +
+                       (f"refreshed {s['last_success_age']}s ago" if s['last_success_age'] is not None else "never refreshed") +
+                       (f", error: {s['error']}" if s['error'] else "")
+                       for s in status['sources']
+                   ])
+        }]
+    }
+
+
+# Name -> Tool, built once at import; every TOOLS entry must have a handler
+REGISTRY = {spec['name']: Tool(spec, TOOL_HANDLERS[spec['name']]) for spec in TOOLS}
+
+
+def handle_message(data, allow_stream=False):
+    """
+    Handle one MCP message
+
+    Returns:
+        (body, status), or a streaming Response when allow_stream is set
+        and the call asked for one
+    """
+    if not isinstance(data, dict):
+        return {"error": "Invalid request"}, 400
     method = data.get('method')
-    params = data.get('params', {})
+    params = data.get('params') or {}
+    if not isinstance(params, dict):
+        return {"error": "params must be an object"}, 400
 
     # List available tools
     if method == 'tools/list':
-        return jsonify({"tools": TOOLS})
+        return {"tools": TOOLS}, 200
 
     # Call tool
     if method == 'tools/call':
         tool_name = params.get('name')
         arguments = params.get('arguments', {})
+        label = tool_name if tool_name in REGISTRY else 'unknown'
 
-        if tool_name == 'privacy_feed':
-            limit = arguments.get('limit', 50)
-            offset = arguments.get('offset', 0)
-            items = privacy_agg.get_feed(limit=limit, offset=offset)
-
-            return jsonify({
-                "content": [{
-                    "type": "text",
-                    "text": f"Found {len(items)} privacy news items:\n\n" +
-                           "\n\n".join([
-                               f"**{item['title']}**\n{item['source']} | {item['published']}\n{item['url']}\n{item['content'][:200]}..."
-                               for item in items
-                           ])
-                }]
-            })
+        started = time.time()
+        result = handle_tool_call(tool_name, arguments, allow_stream)
+        status = result.status_code if isinstance(result, Response) else result[1]
+        TOOL_REQUESTS.inc(label, str(status))
+        TOOL_SECONDS.observe(time.time() - started, label)
+        return result
 
-        elif tool_name == 'privacy_search':
-            query = arguments.get('query')
-            limit = arguments.get('limit', 50)
-            results = privacy_agg.search(query, limit=limit)
-
-            return jsonify({
-                "content": [{
-                    "type": "text",
-                    "text": f"Found {len(results)} results for '{query}':\n\n" +
-                           "\n\n".join([
-                               f"**{item['title']}**\n{item['source']} | {item['published']}\n{item['url']}"
-                               for item in results
-                           ])
-                }]
-            })
+    return {"error": f"Unknown method: {method}"}, 400
 
-        elif tool_name == 'privacy_breaches':
-            days = arguments.get('days', 30)
-            breaches = privacy_agg.get_data_breaches(days=days)
-
-            return jsonify({
-                "content": [{
-                    "type": "text",
-                    "text": f"Data Breaches (last {days} days):\n\n" +
-                           "\n\n".join([
-                               f"**{item['title']}**\n{item['source']} | {item['published']}\n{item['url']}"
-                               for item in breaches
-                           ]) if breaches else "No recent data breach notifications found."
-                }]
-            })
 
-        elif tool_name == 'privacy_track_domain':
-            domain = arguments.get('domain')
-            result = privacy_agg.track_privacy_policy(domain)
-
-            return jsonify({
-                "content": [{
-                    "type": "text",
-                    "text": f"Privacy Policy Tracking: {domain}\n\n" +
-                           f"Status: {result['status']}\n" +
-                           f"Note: {result['note']}\n\n" +
-                           f"Related Death2Data domains:\n" +
-                           "\n".join([f"- {d}" for d in result['related_domains']])
-                }]
-            })
+def handle_tool_call(tool_name, arguments, allow_stream=False):
+    """tools/call body of handle_message (same return convention)"""
+    registered = REGISTRY.get(tool_name)
+    if registered is None:
+        return {"error": f"Unknown tool: {tool_name}"}, 400
 
-        elif tool_name == 'privacy_analyze_policy':
-            url = arguments.get('url')
-            result = privacy_agg.analyze_privacy_policy(url)
-
-            return jsonify({
-                "content": [{
-                    "type": "text",
-                    "text": f"Privacy Policy Analysis: {url}\n\n" +
-                           f"Status: {result['status']}\n" +
-                           f"Note: {result['note']}\n\n" +
-                           f"Available tools:\n" +
-                           "\n".join([f"- {t}" for t in result['tools_available']])
-                }]
-            })
+    try:
+        arguments = registered.validate(arguments)
 
-        elif tool_name == 'privacy_legislation':
-            updates = privacy_agg.get_legislation_updates()
-
-            return jsonify({
-                "content": [{
-                    "type": "text",
-                    "text": "Privacy Legislation Updates:\n\n" +
-                           "\n\n".join([
-                               f"**{item['title']}**\n{item['source']} | {item['published']}\n{item['url']}"
-                               for item in updates[:20]
-                           ]) if updates else "No recent legislation updates found."
-                }]
-            })
+        if allow_stream and tool_name == 'privacy_feed' and wants_stream(arguments):
+            return stream_feed(arguments)
 
-        elif tool_name == 'privacy_aggregate':
-            force = arguments.get('force', False)
-            stats = privacy_agg.aggregate(force=force)
+        if not registered.cacheable:
+            return registered.handler(arguments), 200
+
+        key = response_cache.key(tool_name, arguments)
+        result = response_cache.get(key, privacy_agg.generation)
+        if result is None:
+            result = registered.handler(arguments)
+            response_cache.put(key, result, privacy_agg.generation)
+    except ValueError as e:
+        return {"error": str(e)}, 400
+
+    return result, 200
 
-            return jsonify({
-                "content": [{
-                    "type": "text",
-                    "text": f"Aggregation complete:\n- Fetched: {stats['fetched']} items\n- New: {stats['new']} items"
-                }]
-            })
 
-        return jsonify({"error": f"Unknown tool: {tool_name}"}), 400
+def handle_batch(messages):
+    """
+    Handle a JSON-RPC batch
 
-    return jsonify({"error": f"Unknown method: {method}"}), 400
+    Tool calls in a batch are independent, so they run concurrently on
+    batch_pool; responses come back in request order, each carrying the
+    request's id when it had one. A message that fails only gets an error
+    entry of its own.
+    """
+    def run(message):
+        if not isinstance(message, dict):
+            return {"error": "Invalid request"}
+        try:
+            body, _ = handle_message(message)
+        except Exception as e:
+            print(f"Error in batch message: {e!r}")
+            body = {"error": f"Internal error: {type(e).__name__}"}
+        if 'id' in message:
+            body = {"id": message['id'], **body}
+        return body
 
+    return list(batch_pool.map(run, messages))
 
-@app.route('/health', methods=['GET'])
+
+@bp.route('/mcp', methods=['POST'])
+def mcp_handler():
+    """MCP protocol handler (single message or JSON-RPC batch)"""
+    data = request.get_json()
+
+    if isinstance(data, list):
+        if not data:
+            return jsonify({"error": "Empty batch"}), 400
+        if len(data) > BATCH_LIMIT:
+            return jsonify({"error": f"Batch too large (max {BATCH_LIMIT})"}), 400
+        return jsonify(handle_batch(data))
+
+    result = handle_message(data, allow_stream=True)
+    if isinstance(result, Response):
+        return result
+
+    body, status = result
+    return jsonify(body), status
+
+
+@bp.route('/health', methods=['GET'])
 def health():
-    """Health check endpoint"""
-    return jsonify({"status": "ok", "domain": "privacy"})
+    """Health check endpoint with per-source refresh age"""
+    now = time.time()
+    return jsonify({
+        "status": "ok",
+        "domain": "privacy",
+        "items": len(privacy_agg.items),
+        "sources": {
+            name: {
+                "last_success_age": round(now - state['last_success']) if state['last_success'] else None,
+                "stale": not state['last_success'] or now - state['last_success'] > 3 * state['interval'],
+                "last_status": state['last_status'],
+                "error": state['last_error'],
+            } for name, state in privacy_agg.source_state.items()
+        }
+    })
 
 
-if __name__ == '__main__':
-    print("Starting Privacy MCP Backend...")
-    print("Running initial aggregation...")
+@bp.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    """Prometheus text exposition"""
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+
+def create_app():
+    """Build the Flask app (gunicorn: 'privacy_mcp:create_app()')"""
+    flask_app = Flask(__name__)
+    flask_app.register_blueprint(bp)
+    return flask_app
+
+
+def warm_start():
+    """
+    Run one blocking aggregation
+
+    gunicorn calls this once in the master before forking, so workers
+    inherit a populated store instead of each fetching on boot.
+    """
     stats = privacy_agg.aggregate()
     print(f"Initial aggregation: {stats['fetched']} fetched, {stats['new']} new")
 
-    app.run(host='0.0.0.0', port=5003, debug=True)
+
+def start_background_refresh():
+    """Start the refresh thread in this process"""
+    refresher.start()
+
+
+app = create_app()
+
+
+if __name__ == '__main__':
+    print("Starting Privacy MCP Backend...")
+    print("Starting background refresh (all sources due now)...")
+    start_background_refresh()
+
+    # Dev server only; the reloader would fork a second refresh thread
+    app.run(host='0.0.0.0', port=5003, debug=os.environ.get('PRIVACY_MCP_DEBUG') == '1',
+            use_reloader=False, threaded=True)
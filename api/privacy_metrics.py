@@ -0,0 +1,104 @@
+"""
+Privacy MCP Metrics
+Minimal Prometheus text-format counters, gauges and histograms
+
+Values are per process; under gunicorn each worker reports its own.
+"""
+
+import bisect
+import threading
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _labels(names, values):
+    if not names:
+        return ''
+    escaped = (str(v).replace('\\', '\\\\').replace('"', '\\"') for v in values)
+    return '{' + ','.join(f'{n}="{v}"' for n, v in zip(names, escaped)) + '}'
+
+
+class Counter:
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self.values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self.values[label_values] = self.values.get(label_values, 0) + amount
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} counter']
+        for values, count in sorted(self.values.items()):
+            lines.append(f'{self.name}{_labels(self.labels, values)} {count}')
+        return lines
+
+
+class Gauge:
+    """
+    Value read from a callback at scrape time: fn() -> {label values: value}
+
+    metric_type='counter' exposes a monotonic count kept elsewhere.
+    """
+
+    def __init__(self, name, help_text, fn, labels=(), metric_type='gauge'):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self.fn = fn
+        self.metric_type = metric_type
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} {self.metric_type}']
+        for values, value in sorted(self.fn().items()):
+            lines.append(f'{self.name}{_labels(self.labels, values)} {value}')
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        self.series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        with self._lock:
+            series = self.series.setdefault(label_values, {'buckets': [0] * len(self.buckets), 'sum': 0.0, 'count': 0})
+            pos = bisect.bisect_left(self.buckets, value)
+            if pos < len(self.buckets):
+                series['buckets'][pos] += 1
+            series['sum'] += value
+            series['count'] += 1
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} histogram']
+        for values, series in sorted(self.series.items()):
+            cumulative = 0
+            for bound, n in zip(self.buckets, series['buckets']):
+                cumulative += n
+                lines.append(f'{self.name}_bucket{_labels(self.labels + ("le",), values + (bound,))} {cumulative}')
+            lines.append(f'{self.name}_bucket{_labels(self.labels + ("le",), values + ("+Inf",))} {series["count"]}')
+            lines.append(f'{self.name}_sum{_labels(self.labels, values)} {series["sum"]}')
+            lines.append(f'{self.name}_count{_labels(self.labels, values)} {series["count"]}')
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self):
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,577 @@
+"""
+Privacy Policy Tracking
+Fetches domains' privacy policies on a schedule and diffs each new version
+
+Snapshot layout:
+    <snapshot_dir>/
+    ├── objects/ab/cdef...   # zlib-compressed text, named by sha256
+    └── domains/<domain>.json  # URL, validators and snapshot history
+"""
+
+import difflib
+import fcntl
+import hashlib
+import html
+import ipaddress
+import json
+import os
+import re
+import socket
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from urllib.parse import urljoin, urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+POLICY_PATHS = ['/privacy', '/privacy-policy', '/legal/privacy', '/policies/privacy', '/privacy.html']
+POLICY_INTERVAL = 24 * 3600
+POLICY_TIMEOUT = (5, 20)
+POLICY_WORKERS = 8
+POLICY_MAX_DOMAINS = 500
+MAX_HISTORY = 50
+MAX_POLICY_BYTES = 2 * 1024 * 1024
+MAX_REDIRECTS = 5
+
+# Public names only: dotted, alphabetic TLD, no port. LOCAL_DOMAIN_RE (hosts,
+# IPs, ports) is accepted only by trackers built with allow_private=True.
+DOMAIN_RE = re.compile(r'^([a-z0-9]([a-z0-9-]*[a-z0-9])?\.)+[a-z]{2,63}$')
+LOCAL_DOMAIN_RE = re.compile(r'^[a-z0-9]([a-z0-9-]*[a-z0-9])?(\.[a-z0-9]([a-z0-9-]*[a-z0-9])?)*(:\d{1,5})?$')
+RESERVED_SUFFIXES = ('.localhost', '.local', '.internal', '.intranet', '.lan', '.home.arpa', '.corp')
+BLOCK_TAG_RE = re.compile(r'<\s*(/?)(p|div|li|tr|br|section|article|h[1-6])\b[^>]*>', re.IGNORECASE)
+HEADING_OPEN_RE = re.compile(r'<\s*h[1-6]\b[^>]*>', re.IGNORECASE)
+DROP_RE = re.compile(r'<(script|style|noscript|nav|footer)\b.*?</\1\s*>', re.IGNORECASE | re.DOTALL)
+
+
+def policy_text(body):
+    """
+    Reduce a policy page to stable, diffable lines
+
+    Block elements become line breaks and headings are prefixed with
+    '## ' so the diff can be grouped by section.
+    """
+    body = DROP_RE.sub(' ', body)
+    body = HEADING_OPEN_RE.sub('\n## ', body)
+    body = BLOCK_TAG_RE.sub('\n', body)
+    body = html.unescape(re.sub(r'<[^>]+>', ' ', body))
+    lines = (re.sub(r'\s+', ' ', line).strip() for line in body.split('\n'))
+    return '\n'.join(line for line in lines if line and line != '##')
+
+
+def is_public_address(address):
+    """True if an IP address (string) is globally routable"""
+    address = ipaddress.ip_address(address.split('%')[0])
+    return (getattr(address, 'ipv4_mapped', None) or address).is_global
+
+
+def is_public_host(host):
+    """True if every address the host resolves to is globally routable"""
+    try:
+        infos = socket.getaddrinfo(host, None, proto=socket.IPPROTO_TCP)
+    except (socket.gaierror, UnicodeError):
+        return False
+    return bool(infos) and all(is_public_address(info[4][0]) for info in infos)
+
+
+class PublicConnectionMixin:
+    """
+    Refuses a connection whose peer is not a public address
+
+    is_public_host() and the connect resolve the name separately, so a
+    rebinding DNS server could answer the second lookup with an internal
+    address. The peer is checked before any request bytes are sent.
+    """
+
+    def _new_conn(self):
+        sock = super()._new_conn()
+        peer = sock.getpeername()[0]
+        if not is_public_address(peer):
+            sock.close()
+            raise ValueError(f"Refusing to fetch non-public host: {self.host} resolved to {peer}")
+        return sock
+
+
+class PublicHTTPConnection(PublicConnectionMixin, HTTPConnection):
+    pass
+
+
+class PublicHTTPSConnection(PublicConnectionMixin, HTTPSConnection):
+    pass
+
+
+class PublicHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = PublicHTTPConnection
+
+
+class PublicHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = PublicHTTPSConnection
+
+
+class PublicAdapter(HTTPAdapter):
+    """Transport adapter whose connections only reach public addresses"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': PublicHTTPConnectionPool,
+            'https': PublicHTTPSConnectionPool,
+        }
+
+
+def policy_session(user_agent, allow_private=False):
+    """requests.Session for open_url, pinned to public peers unless allow_private"""
+    session = requests.Session()
+    session.headers['User-Agent'] = user_agent
+    if not allow_private:
+        session.mount('http://', PublicAdapter())
+        session.mount('https://', PublicAdapter())
+    return session
+
+
+def open_url(session, url, headers=None, allow_private=False):
+    """
+    Streaming GET of an untrusted URL
+
+    Redirects are followed by hand so that every hop is checked: unless
+    allow_private is set, a host resolving to a loopback, private,
+    link-local or otherwise non-public address is refused. Sessions from
+    policy_session() also check the address actually connected to.
+
+    Returns:
+        (final URL, response) -- the body is not read yet
+    """
+    for _ in range(MAX_REDIRECTS + 1):
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https') or not parts.hostname:
+            raise ValueError(f"Unsupported URL: {url}")
+        if not allow_private and not is_public_host(parts.hostname):
+            raise ValueError(f"Refusing to fetch non-public host: {parts.hostname}")
+        resp = session.get(url, headers=headers, timeout=POLICY_TIMEOUT, stream=True, allow_redirects=False)
+        if not resp.is_redirect:
+            return url, resp
+        url = urljoin(url, resp.headers['Location'])
+        resp.close()
+    raise ValueError(f"Too many redirects from {url}")
+
+
+def read_text(resp, max_bytes=MAX_POLICY_BYTES):
+    """Response body as text, refusing bodies over max_bytes"""
+    chunks, size = [], 0
+    try:
+        for chunk in resp.iter_content(64 * 1024):
+            size += len(chunk)
+            if size > max_bytes:
+                raise ValueError(f"Policy page larger than {max_bytes} bytes")
+            chunks.append(chunk)
+    finally:
+        resp.close()
+    return b''.join(chunks).decode(resp.encoding or 'utf-8', errors='replace')
+
+
+def split_sections(text):
+    """{section heading: section text}, 'Preamble' for text before the first heading"""
+    sections = {}
+    current, lines = 'Preamble', []
+    for line in text.split('\n'):
+        if line.startswith('## '):
+            sections[current] = '\n'.join(lines)
+            current, lines = line[3:], []
+        else:
+            lines.append(line)
+    sections[current] = '\n'.join(lines)
+    return {k: v for k, v in sections.items() if v or k != 'Preamble'}
+
+
+class PolicyTracker:
+    """
+    Tracks privacy policy changes for a set of domains
+
+    Each check is a conditional GET; a 304 or an unchanged content hash
+    costs no parsing of history, no blob write and no diff. Only when the
+    hash changes is the new text stored (deduplicated by hash) and diffed
+    line- and section-wise against the previous snapshot.
+
+    The domain files are the source of truth: records are re-read before
+    use and written under a per-domain file lock, so any number of
+    processes can share one snapshot directory.
+    """
+
+    def __init__(self, snapshot_dir, interval=POLICY_INTERVAL, scheme='https', workers=POLICY_WORKERS,
+                 allow_private=False, max_domains=POLICY_MAX_DOMAINS):
+        self.root = Path(snapshot_dir)
+        self.interval = interval
+        self.scheme = scheme
+        self.workers = workers
+        self.max_domains = max_domains
+        self.allow_private = allow_private
+        (self.root / 'objects').mkdir(parents=True, exist_ok=True)
+        (self.root / 'domains').mkdir(parents=True, exist_ok=True)
+        self.records = {}
+        self._scan()
+        self._init_session()
+        os.register_at_fork(after_in_child=self._init_session)
+
+    def _init_session(self):
+        self.session = policy_session('Death2Data-PolicyTracker/1.0', self.allow_private)
+
+    def _object_path(self, digest):
+        return self.root / 'objects' / digest[:2] / digest[2:]
+
+    def put_object(self, text):
+        """Store text by content hash (no-op if already present)"""
+        digest = hashlib.sha256(text.encode()).hexdigest()
+        path = self._object_path(digest)
+        if not path.exists():
+            path.parent.mkdir(exist_ok=True)
+            tmp = path.with_suffix('.tmp')
+            tmp.write_bytes(zlib.compress(text.encode(), 9))
+            os.replace(tmp, path)
+        return digest
+
+    def get_object(self, digest):
+        return zlib.decompress(self._object_path(digest).read_bytes()).decode()
+
+    def _domain_path(self, domain):
+        return self.root / 'domains' / f"{domain.replace(':', '_')}.json"
+
+    def _scan(self):
+        """Reload every domain record, including ones written by other processes"""
+        records = {}
+        for path in (self.root / 'domains').glob('*.json'):
+            try:
+                record = json.loads(path.read_text())
+            except (OSError, ValueError):
+                continue
+            records[record['domain']] = record
+        self.records = records
+
+    def load(self, domain):
+        """The domain's record as currently on disk, or None"""
+        try:
+            record = json.loads(self._domain_path(domain).read_text())
+        except FileNotFoundError:
+            self.records.pop(domain, None)
+            return None
+        self.records[domain] = record
+        return record
+
+    @contextmanager
+    def _locked(self, domain):
+        """Exclusive lock on one domain's record, across threads and processes"""
+        with open(self._domain_path(domain).with_suffix('.lock'), 'a') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def save(self, record):
+        """Write a record; callers hold _locked(domain)"""
+        self.records[record['domain']] = record
+        path = self._domain_path(record['domain'])
+        tmp = path.with_suffix('.tmp')
+        tmp.write_text(json.dumps(record, indent=2))
+        os.replace(tmp, path)
+
+    def domains(self):
+        self._scan()
+        return sorted(self.records)
+
+    def normalize_domain(self, domain):
+        """Bare lowercase host; internal hosts, IPs and ports only with allow_private"""
+        domain = (domain or '').strip().lower()
+        domain = re.sub(r'^https?://', '', domain).split('/')[0]
+        if self.allow_private:
+            if LOCAL_DOMAIN_RE.match(domain):
+                return domain
+        elif DOMAIN_RE.match(domain) and not domain.endswith(RESERVED_SUFFIXES):
+            return domain
+        raise ValueError(f"Invalid domain: {domain}")
+
+    def track(self, domain):
+        """
+        Start tracking a domain
+
+        A new domain is only recorded here; its first check is left to the
+        refresh scheduler (it is due immediately), so callers never wait
+        on the remote site.
+
+        Returns:
+            The domain's record
+
+        Raises:
+            ValueError: Invalid domain, or max_domains are already tracked
+        """
+        domain = self.normalize_domain(domain)
+        with self._locked(domain):
+            record = self.load(domain)
+            if record is None:
+                # Counted on disk so the cap holds across processes sharing the directory
+                if sum(1 for _ in (self.root / 'domains').glob('*.json')) >= self.max_domains:
+                    raise ValueError(f"Already tracking the maximum of {self.max_domains} domains")
+                record = {
+                    'domain': domain,
+                    'url': None,
+                    'etag': None,
+                    'last_modified': None,
+                    'added_at': time.time(),
+                    'last_checked': None,
+                    'last_changed': None,
+                    'last_error': None,
+                    'snapshots': [],
+                }
+                self.save(record)
+        return record
+
+    def _fetch(self, record):
+        """
+        Conditional GET of the known policy URL, or discover one
+
+        Returns:
+            (url, response, text) -- text is None on a 304
+        """
+        headers = {}
+        if record['etag']:
+            headers['If-None-Match'] = record['etag']
+        if record['last_modified']:
+            headers['If-Modified-Since'] = record['last_modified']
+
+        urls = [record['url']] if record['url'] else [f"{self.scheme}://{record['domain']}{p}" for p in POLICY_PATHS]
+        last_error = None
+        for url in urls:
+            try:
+                url, resp = open_url(self.session, url, headers, allow_private=self.allow_private)
+                if resp.status_code == 304:
+                    resp.close()
+                    return url, resp, None
+                if resp.ok:
+                    return url, resp, read_text(resp)
+                resp.close()
+                last_error = f"HTTP {resp.status_code} from {url}"
+            except (requests.RequestException, ValueError) as e:
+                last_error = str(e)
+        raise RuntimeError(last_error or 'No policy URL found')
+
+    def check(self, domain):
+        """
+        Fetch a domain's policy and record a snapshot if it changed
+
+        The fetch runs unlocked; the result is merged into the record as
+        re-read under the lock.
+
+        Returns:
+            The updated record (None if the domain is not tracked)
+        """
+        record = self.load(domain)
+        if record is None:
+            return None
+        checked_at = time.time()
+        url, resp, text, error = None, None, None, None
+        try:
+            url, resp, text = self._fetch(record)
+        except Exception as e:
+            error = str(e)
+
+        with self._locked(domain):
+            record = self.load(domain) or record
+            record['last_checked'] = checked_at
+            record['last_error'] = error
+            try:
+                if resp is not None and resp.status_code != 304:
+                    record['url'] = url
+                    record['etag'] = resp.headers.get('ETag')
+                    record['last_modified'] = resp.headers.get('Last-Modified')
+                    self._record_snapshot(record, policy_text(text))
+            except Exception as e:
+                record['last_error'] = str(e)
+            self.save(record)
+        return record
+
+    def _record_snapshot(self, record, text):
+        digest = hashlib.sha256(text.encode()).hexdigest()
+        previous = record['snapshots'][-1] if record['snapshots'] else None
+        if previous and previous['hash'] == digest:
+            return
+
+        self.put_object(text)
+        snapshot = {'hash': digest, 'fetched_at': record['last_checked'], 'diff': None}
+        if previous:
+            snapshot['diff'] = self.diff(previous['hash'], digest)
+            record['last_changed'] = record['last_checked']
+        record['snapshots'] = (record['snapshots'] + [snapshot])[-MAX_HISTORY:]
+
+    def diff(self, old_hash, new_hash):
+        """
+        Line and section diff between two snapshots
+
+        Returns:
+            Dict with added/removed line counts, added/removed/changed
+            section headings and the hash of the stored unified diff
+        """
+        old_text, new_text = self.get_object(old_hash), self.get_object(new_hash)
+        unified = list(difflib.unified_diff(old_text.split('\n'), new_text.split('\n'),
+                                            'previous', 'current', lineterm='', n=1))
+        old_sections, new_sections = split_sections(old_text), split_sections(new_text)
+        return {
+            'added_lines': sum(1 for l in unified if l.startswith('+') and not l.startswith('+++')),
+            'removed_lines': sum(1 for l in unified if l.startswith('-') and not l.startswith('---')),
+            'sections_added': [s for s in new_sections if s not in old_sections],
+            'sections_removed': [s for s in old_sections if s not in new_sections],
+            'sections_changed': [s for s in new_sections
+                                 if s in old_sections and new_sections[s] != old_sections[s]],
+            'unified': self.put_object('\n'.join(unified)),
+        }
+
+    def next_due(self):
+        """Earliest time any tracked domain is due (None if none tracked)"""
+        return min(((r['last_checked'] or 0) + self.interval for r in self.records.values()), default=None)
+
+    def check_due(self):
+        """
+        Check every domain whose interval has elapsed
+
+        Returns:
+            List of domains whose policy changed
+        """
+        self._scan()
+        now = time.time()
+        due = [d for d, r in self.records.items() if (r['last_checked'] or 0) + self.interval <= now]
+        if not due:
+            return []
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='policy-check') as pool:
+            records = [r for r in pool.map(self.check, due) if r]
+        return [r['domain'] for r in records if r['last_changed'] and r['last_changed'] >= now]
+
+
+# (category, weight, pattern). Positive weights are privacy-invasive,
+# negative ones protective. Protective phrasings come first and swallow
+# the whole clause, so "we do not sell or rent your personal information"
+# is not matched again by the "rent ... information" sharing rule.
+# POLICY_RULES_RE anchors every pattern on word boundaries; words after a
+# [^.] gap carry their own \b so "rent ... metadata" does not match.
+POLICY_RULES = [
+    ('sharing', -3, r"(do not|don't|never|will not) (sell|rent|trade)(,? (or|and|nor) (sell|rent|trade|share))*"
+                    r"([^.]{0,30}\b(data|information))?"),
+    ('retention', -2, r"delete[^.]{0,60}\bwithin \d+ (days|months)"),
+    ('rights', -1, r"right to (delete|deletion|erasure|access|portability)"),
+    ('rights', -1, r"opt[- ]out"),
+    ('collection', 1, r"we (may |also |automatically )?collect"),
+    ('collection', 3, r"biometric"),
+    ('collection', 2, r"(precise )?geolocation|location data"),
+    ('collection', 2, r"health (data|information)|medical information"),
+    ('collection', 2, r"browsing (history|activity)"),
+    ('collection', 1, r"device identifiers?|advertising (id|identifier)s?"),
+    ('collection', 1, r"cookies|web beacons?|tracking pixels?"),
+    ('collection', 1, r"contacts|address book"),
+    ('sharing', 3, r"(sell|rent)[^.]{0,30}\b(personal )?(data|information)"),
+    ('sharing', 3, r"data brokers?"),
+    ('sharing', 2, r"advertising partners?|ad networks?|advertisers"),
+    ('sharing', 1, r"third[- ]part(y|ies)"),
+    ('sharing', 1, r"affiliates"),
+    ('sharing', 1, r"law enforcement"),
+    ('retention', 3, r"(retain|keep|store)[^.]{0,60}\b(indefinitely|as long as (necessary|needed|we))"),
+    ('retention', 1, r"backups?"),
+    ('retention', 1, r"retain\w*"),
+]
+POLICY_CATEGORIES = ('collection', 'sharing', 'retention', 'rights')
+ANALYSIS_CACHE_SIZE = 512
+MAX_FINDINGS = 25
+
+# One alternation with a named group per rule; match.lastgroup names the rule
+POLICY_RULES_RE = re.compile(
+    '|'.join(rf'(?P<r{i}>\b(?:{pattern})\b)' for i, (_, _, pattern) in enumerate(POLICY_RULES)),
+    re.IGNORECASE
+)
+
+
+class PolicyAnalyzer:
+    """
+    Scores collection, sharing and retention clauses in privacy policies
+
+    Every rule is matched in a single scan with POLICY_RULES_RE. Results
+    are memoized by the sha256 of the normalized policy text, so the same
+    policy served from any URL (or fetched again) is a cache hit.
+    """
+
+    def __init__(self, cache_size=ANALYSIS_CACHE_SIZE, workers=POLICY_WORKERS, allow_private=False):
+        self.cache_size = cache_size
+        self.workers = workers
+        self.allow_private = allow_private
+        self.cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._init_session()
+        os.register_at_fork(after_in_child=self._init_session)
+
+    def _init_session(self):
+        self._lock = threading.Lock()
+        self.session = policy_session('Death2Data-PolicyAnalyzer/1.0', self.allow_private)
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='policy-analyze')
+
+    def analyze_text(self, text):
+        """
+        Analyze normalized policy text (memoized by content hash)
+
+        Returns:
+            (analysis dict, cache hit)
+        """
+        digest = hashlib.sha256(text.encode()).hexdigest()
+        with self._lock:
+            if digest in self.cache:
+                self.cache.move_to_end(digest)
+                self.hits += 1
+                return self.cache[digest], True
+            self.misses += 1
+
+        scores = dict.fromkeys(POLICY_CATEGORIES, 0)
+        findings = []
+        sections = split_sections(text)
+        for heading, body in sections.items():
+            for match in POLICY_RULES_RE.finditer(body):
+                category, weight, _ = POLICY_RULES[int(match.lastgroup[1:])]
+                scores[category] += weight
+                if len(findings) < MAX_FINDINGS:
+                    findings.append({'category': category, 'weight': weight,
+                                     'section': heading, 'phrase': match.group(0)})
+
+        risk = sum(max(0, scores[c]) for c in ('collection', 'sharing', 'retention')) + min(0, scores['rights'])
+        analysis = {
+            'hash': digest,
+            'sections': len(sections),
+            'scores': scores,
+            'risk': 'high' if risk >= 15 else 'medium' if risk >= 6 else 'low',
+            'findings': findings,
+        }
+
+        with self._lock:
+            self.cache[digest] = analysis
+            while len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+        return analysis, False
+
+    def analyze_url(self, url):
+        """Fetch and analyze one policy URL"""
+        if not re.match(r'^https?://', url or ''):
+            return {'url': url, 'status': 'error', 'error': 'URL must start with http:// or https://'}
+        try:
+            _, resp = open_url(self.session, url, allow_private=self.allow_private)
+            if not resp.ok:
+                resp.close()
+                resp.raise_for_status()
+            text = read_text(resp)
+        except (requests.RequestException, ValueError) as e:
+            return {'url': url, 'status': 'error', 'error': str(e)}
+
+        analysis, cached = self.analyze_text(policy_text(text))
+        return {'url': url, 'status': 'analyzed', 'cached': cached, **analysis}
+
+    def analyze_urls(self, urls):
+        """Analyze several URLs on the worker pool, results in input order"""
+        return list(self._pool.map(self.analyze_url, urls))
@@ -0,0 +1,79 @@
+"""
+Privacy MCP Tool Schemas
+Validation of tools/call arguments against each tool's inputSchema
+"""
+
+import math
+
+SCHEMA_TYPES = {
+    'string': str,
+    'integer': (int, float),
+    'number': (int, float),
+    'boolean': bool,
+    'array': list,
+    'object': dict,
+}
+
+
+def compile_schema(schema):
+    """
+    Build a validator for a tool inputSchema
+
+    The validator fills defaults, drops unknown properties, clamps numbers
+    into [minimum, maximum] and raises ValueError for missing required
+    fields, wrong types, non-finite numbers or over-long strings.
+    """
+    properties = schema.get('properties', {})
+    required = set(schema.get('required', []))
+    checks = []
+
+    for prop, spec in properties.items():
+        expected = SCHEMA_TYPES[spec['type']]
+        checks.append((prop, spec, expected))
+
+    def validate(arguments):
+        if not isinstance(arguments, dict):
+            raise ValueError("arguments must be an object")
+
+        validated = {}
+        for prop, spec, expected in checks:
+            if prop not in arguments or arguments[prop] is None:
+                if prop in required:
+                    raise ValueError(f"Missing required argument: {prop}")
+                if 'default' in spec:
+                    validated[prop] = spec['default']
+                continue
+
+            value = arguments[prop]
+            # bool is an int subclass; only accept it where a boolean is expected
+            if not isinstance(value, expected) or (isinstance(value, bool) and spec['type'] != 'boolean'):
+                raise ValueError(f"Argument {prop} must be of type {spec['type']}")
+
+            # Ints are exact at any size; only floats can be inf or nan
+            if isinstance(value, float) and not math.isfinite(value):
+                raise ValueError(f"Argument {prop} must be a finite number")
+            if spec['type'] == 'integer':
+                if value != int(value):
+                    raise ValueError(f"Argument {prop} must be an integer")
+                value = int(value)
+            if spec['type'] in ('integer', 'number'):
+                if 'minimum' in spec:
+                    value = max(value, spec['minimum'])
+                if 'maximum' in spec:
+                    value = min(value, spec['maximum'])
+            if spec['type'] == 'string':
+                if len(value) < spec.get('minLength', 0):
+                    raise ValueError(f"Argument {prop} is too short")
+                if len(value) > spec.get('maxLength', len(value)):
+                    raise ValueError(f"Argument {prop} is too long (max {spec['maxLength']})")
+            if spec['type'] == 'array':
+                if len(value) > spec.get('maxItems', len(value)):
+                    raise ValueError(f"Argument {prop} has too many items (max {spec['maxItems']})")
+                item_type = SCHEMA_TYPES[spec.get('items', {}).get('type', 'object')]
+                if not all(isinstance(v, item_type) for v in value):
+                    raise ValueError(f"Argument {prop} items must be of type {spec['items']['type']}")
+
+            validated[prop] = value
+        return validated
+
+    return validate
@@ -0,0 +1,152 @@
+"""
+Privacy Item Store
+Durable SQLite (WAL) storage underneath PrivacyAggregator
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    id TEXT PRIMARY KEY,
+    source TEXT NOT NULL,
+    published TEXT NOT NULL,
+    data TEXT NOT NULL,
+    ingested_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS items_published ON items (published);
+CREATE INDEX IF NOT EXISTS items_ingested ON items (ingested_at);
+CREATE TABLE IF NOT EXISTS sources (
+    name TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    last_success REAL
+);
+CREATE TABLE IF NOT EXISTS refresh_requests (
+    id INTEGER PRIMARY KEY,
+    force INTEGER NOT NULL,
+    requested_at REAL NOT NULL
+);
+"""
+
+# Polling state saved per source, so worker processes that don't poll can report it
+SOURCE_FIELDS = ('etag', 'last_modified', 'last_success', 'last_checked', 'last_status', 'last_error', 'next_due')
+SOURCE_COLUMN_TYPES = {'last_checked': 'REAL', 'last_status': 'INTEGER', 'last_error': 'TEXT', 'next_due': 'REAL'}
+
+
+class ItemStore:
+    """
+    Feed items and per-source HTTP validators in one SQLite file
+
+    WAL mode lets readers in other worker processes run alongside the
+    writer. Only one process polls and writes; the others follow it with
+    changed_since(), which returns rows in write order after a watermark.
+    Retention pruning deletes old rows; compact() checkpoints the WAL and
+    hands freed pages back to the filesystem.
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._connect()
+        # A connection must not be shared with forked gunicorn workers
+        os.register_at_fork(after_in_child=self._connect)
+
+    def _connect(self):
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute('PRAGMA auto_vacuum=INCREMENTAL')
+        self.conn.executescript(SCHEMA)
+        # Stores created before the polling state was saved lack its columns
+        columns = {row[1] for row in self.conn.execute('PRAGMA table_info(sources)')}
+        for column, kind in SOURCE_COLUMN_TYPES.items():
+            if column not in columns:
+                try:
+                    self.conn.execute(f'ALTER TABLE sources ADD COLUMN {column} {kind}')
+                except sqlite3.OperationalError:
+                    pass  # Another process added it first
+
+    def upsert(self, items):
+        """Insert or replace items"""
+        with self._lock, self.conn:
+            # Stamped under the lock, so ingested_at follows commit order
+            now = time.time()
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO items (id, source, published, data, ingested_at) VALUES (?, ?, ?, ?, ?)',
+                [(item['id'], item['source'], item['published'], json.dumps(item), now) for item in items]
+            )
+
+    def changed_since(self, watermark):
+        """
+        Items written after a watermark, in write order
+
+        Returns:
+            (items, new watermark)
+        """
+        with self._lock:
+            rows = self.conn.execute(
+                'SELECT data, ingested_at FROM items WHERE ingested_at > ? ORDER BY ingested_at, published',
+                (watermark,)).fetchall()
+        if rows:
+            watermark = rows[-1][1]
+        return [json.loads(data) for data, _ in rows], watermark
+
+    def prune(self, published_before):
+        """Delete items published before a cutoff"""
+        with self._lock, self.conn:
+            self.conn.execute('DELETE FROM items WHERE published < ?', (published_before,))
+
+    def compact(self):
+        """Checkpoint the WAL and release free pages"""
+        with self._lock:
+            self.conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+            self.conn.execute('PRAGMA incremental_vacuum')
+
+    def size_bytes(self):
+        """Database plus WAL size on disk"""
+        return sum(os.path.getsize(p) for p in (self.path, self.path + '-wal') if os.path.exists(p))
+
+    def save_source(self, name, state):
+        """Save a source's validators and polling state"""
+        with self._lock, self.conn:
+            self.conn.execute(
+                f'INSERT OR REPLACE INTO sources (name, {", ".join(SOURCE_FIELDS)}) '
+                f'VALUES (?{", ?" * len(SOURCE_FIELDS)})',
+                (name, *(state[field] for field in SOURCE_FIELDS))
+            )
+
+    def load_source(self, name):
+        """Saved validators and polling state for a source, or None"""
+        with self._lock:
+            row = self.conn.execute(
+                f'SELECT {", ".join(SOURCE_FIELDS)} FROM sources WHERE name = ?', (name,)).fetchone()
+        if row is None:
+            return None
+        saved = dict(zip(SOURCE_FIELDS, row))
+        if saved['next_due'] is None:
+            del saved['next_due']  # Saved before polling state was kept
+        return saved
+
+    def request_refresh(self, force=False):
+        """Queue a refresh for whichever process polls the sources"""
+        with self._lock, self.conn:
+            self.conn.execute('INSERT INTO refresh_requests (force, requested_at) VALUES (?, ?)',
+                              (int(force), time.time()))
+
+    def take_refresh_request(self):
+        """
+        Claim all queued refresh requests
+
+        Returns:
+            None if nothing is queued, else whether any of them asked to force
+        """
+        with self._lock, self.conn:
+            count, force = self.conn.execute('SELECT COUNT(*), MAX(force) FROM refresh_requests').fetchone()
+            if not count:
+                return None
+            self.conn.execute('DELETE FROM refresh_requests')
+        return bool(force)
@@ -0,0 +1,16 @@
+"""
+Shared setup: the API modules live in api/ and the PDF processor is a
+script with a dash in its name, so both are put on the import path here.
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / 'api'))
+
+spec = importlib.util.spec_from_file_location('pdf_processor', ROOT / 'tools' / 'pdf-processor.py')
+pdf_processor = importlib.util.module_from_spec(spec)
+sys.modules['pdf_processor'] = pdf_processor  # Registered first so worker processes can unpickle it
+spec.loader.exec_module(pdf_processor)
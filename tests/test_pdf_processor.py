@@ -0,0 +1,230 @@
+import http.server
+import json
+import re
+import threading
+import time
+
+import pytest
+
+import pdf_processor
+from pdf_processor import AnalysisCache, Manifest, OllamaClient, iter_chunks, output_dir_for
+
+
+class StubOllama(http.server.ThreadingHTTPServer):
+    """
+    /api/generate streaming "analysis of <marker>" back as NDJSON
+
+    The marker is the first MARK-n word of the prompt. Prompts containing
+    FLAKY fail with a 500 the first time they are seen, BROKEN always;
+    SLOW ones take two seconds and CLOSE drops the connection afterwards.
+    """
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), StubHandler)
+        self.calls = {}
+        self.lock = threading.Lock()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class StubHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        prompt = payload['prompt']
+        marker = re.search(r'MARK-\d+', prompt).group()
+        with self.server.lock:
+            self.server.calls[marker] = calls = self.server.calls.get(marker, 0) + 1
+        if 'BROKEN' in prompt or ('FLAKY' in prompt and calls == 1):
+            self.reply(500, [{'error': 'model crashed'}])
+            return
+        # Later sections answer first, so results come back out of order
+        time.sleep(2 if 'SLOW' in prompt else 0.05 * (10 - int(marker[5:])) / 10)
+        self.reply(200, [{'response': 'analysis ', 'done': False}, {'response': f'of {marker}', 'done': False},
+                         {'response': '', 'done': True}])
+        if 'CLOSE' in prompt:
+            self.close_connection = True  # As an idle keep-alive timeout would
+
+    def reply(self, status, lines):
+        body = b''.join(json.dumps(line).encode() + b'\n' for line in lines)
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/x-ndjson')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def ollama(monkeypatch):
+    server = StubOllama()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(pdf_processor, '_client', OllamaClient(url=server.url, timeout=5))
+    monkeypatch.setattr(pdf_processor, 'OLLAMA_BACKOFF', 0)
+    monkeypatch.setattr(pdf_processor, 'CACHE_MAX_BYTES', 0)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def sections(*extras):
+    return [{'section': i + 1, 'header': f'PART {i}', 'content': f"MARK-{i} {extras[i] if i < len(extras) else ''}"}
+            for i in range(10)]
+
+
+def test_analyze_sections_keeps_order(ollama):
+    results = list(pdf_processor.analyze_sections(sections(), workers=4))
+
+    assert [r['section'] for r in results] == list(range(1, 11))
+    assert [r['analysis'] for r in results] == [f"analysis of MARK-{i}" for i in range(10)]
+    assert all('error' not in r for r in results)
+
+
+def test_analyze_sections_pulls_sections_lazily(ollama):
+    pulled = []
+
+    def source():
+        for section in sections():
+            pulled.append(section['section'])
+            yield section
+
+    results = pdf_processor.analyze_sections(source(), workers=2)
+    next(results)
+    assert len(pulled) <= 5
+    results.close()
+
+
+def test_analyze_sections_retries_then_reports_errors(ollama):
+    results = list(pdf_processor.analyze_sections(sections('FLAKY', '', 'BROKEN'), workers=3))
+
+    assert results[0]['analysis'] == 'analysis of MARK-0'
+    assert ollama.calls['MARK-0'] == 2
+    assert results[2]['analysis'] == '' and 'model crashed' in results[2]['error']
+    assert ollama.calls['MARK-2'] == pdf_processor.OLLAMA_RETRIES
+    assert [r['section'] for r in results] == list(range(1, 11))
+
+
+def test_analysis_cache_evicts_least_recently_used(tmp_path):
+    cache = AnalysisCache(str(tmp_path / 'cache.db'), max_bytes=2000)
+    keys = [cache.key('model', str(i)) for i in range(20)]
+    for key in keys[:10]:
+        cache.put(key, 'x' * 100)
+    assert cache.get(keys[0]) == 'x' * 100  # Now the most recently used
+    for key in keys[10:]:
+        cache.put(key, 'x' * 100)
+
+    assert cache.total == cache._recount() <= 2000
+    assert cache.get(keys[0]) is not None
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[-1]) is not None
+
+
+def test_cached_answers_skip_the_model(ollama, tmp_path, monkeypatch):
+    monkeypatch.setattr(pdf_processor, 'CACHE_MAX_BYTES', 10 ** 6)
+    monkeypatch.setattr(pdf_processor, '_cache', AnalysisCache(str(tmp_path / 'cache.db')))
+    first = list(pdf_processor.analyze_sections(sections(), workers=4))
+    second = list(pdf_processor.analyze_sections(sections(), workers=4))
+
+    assert first == second
+    assert set(ollama.calls.values()) == {1}
+
+
+def test_client_reuses_and_replaces_closed_connections(ollama):
+    client = OllamaClient(url=ollama.url, timeout=5)
+    assert client.generate('MARK-0') == 'analysis of MARK-0'
+    conn = client.local.conn
+    assert client.generate('MARK-1 CLOSE') == 'analysis of MARK-1'
+    assert client.local.conn is conn
+    # The server hung up after the last answer: resent once on a new connection
+    assert client.generate('MARK-2') == 'analysis of MARK-2'
+    assert ollama.calls['MARK-2'] == 1
+
+
+def test_client_does_not_resend_after_a_timeout(ollama):
+    client = OllamaClient(url=ollama.url, timeout=0.5)
+    with pytest.raises(OSError):
+        client.generate('MARK-0 SLOW')
+    assert ollama.calls['MARK-0'] == 1
+
+
+def words(text):
+    return re.findall(r'w\d+_\d+', text)
+
+
+def slide_deck(slides=120, words_per_slide=60):
+    text = ''.join(f"SLIDE NUMBER {i} TITLE\n" + ' '.join(f"w{i}_{j}" for j in range(words_per_slide)) + "\n\f"
+                   for i in range(slides))
+    return text, text.splitlines(True)
+
+
+def test_iter_chunks_merges_small_sections():
+    text, lines = slide_deck()
+    chunks = list(iter_chunks(lines, max_tokens=2000, overlap=100, count_tokens=pdf_processor.approx_tokens))
+
+    assert len(chunks) <= 8
+    assert all(chunk['tokens'] <= 2000 for chunk in chunks)
+    assert re.fullmatch(r'SLIDE NUMBER 0 TITLE \(\+\d+ more\)', chunks[0]['header'])
+    assert chunks[0]['content'].startswith('SLIDE NUMBER 0 TITLE\n')
+    assert 'SLIDE NUMBER 1 TITLE' in chunks[0]['content']
+    # Cuts fall between slides, so nothing is repeated
+    assert [w for chunk in chunks for w in words(chunk['content'])] == words(text)
+
+
+def test_iter_chunks_loses_nothing_and_overlaps_within_a_section():
+    paragraphs = [' '.join(f"w{p}_{j}" for j in range(40)) for p in range(60)]
+    text = "INTRODUCTION TO THINGS\n" + '\n\n'.join(paragraphs) + "\n"
+    chunks = list(iter_chunks(text.splitlines(True), max_tokens=500, overlap=80,
+                              count_tokens=pdf_processor.approx_tokens))
+
+    assert len(chunks) > 1
+    assert all(chunk['tokens'] <= 500 for chunk in chunks)
+    assert [chunk['header'] for chunk in chunks[:3]] == [
+        'INTRODUCTION TO THINGS', 'INTRODUCTION TO THINGS (part 2)', 'INTRODUCTION TO THINGS (part 3)']
+    seen = [w for chunk in chunks for w in words(chunk['content'])]
+    assert list(dict.fromkeys(seen)) == words(text)
+    for previous, current in zip(chunks, chunks[1:]):
+        assert current['content'].startswith(previous['content'].splitlines()[-1])
+
+
+def test_iter_chunks_splits_overlong_lines():
+    line = ' '.join(f"w0_{j}" for j in range(1000))
+    chunks = list(iter_chunks([line], max_tokens=100, overlap=0, count_tokens=pdf_processor.approx_tokens))
+
+    assert all(chunk['tokens'] <= 100 for chunk in chunks)
+    assert [w for chunk in chunks for w in words(chunk['content'])] == words(line)
+
+
+def test_manifest_notices_changed_outputs(tmp_path):
+    (tmp_path / 'images').mkdir()
+    (tmp_path / 'images.json').write_text('[]')
+    (tmp_path / 'images' / 'img-000.png').write_bytes(b'x' * 6000)
+    Manifest(tmp_path).complete('images', 'inputs', ['images.json', 'images/img-000.png'])
+
+    assert Manifest(tmp_path).is_done('images', 'inputs')
+    assert not Manifest(tmp_path).is_done('images', 'other inputs')
+    (tmp_path / 'images' / 'img-000.png').write_bytes(b'y' * 6000)
+    assert not Manifest(tmp_path).is_done('images', 'inputs')
+
+
+
+def test_manifest_keeps_step_info(tmp_path):
+    (tmp_path / 'full-text.txt').write_text('h\u00e9llo')
+    Manifest(tmp_path).complete('text', 'inputs', ['full-text.txt'], chars=5)
+
+    manifest = Manifest(tmp_path)
+    assert manifest.is_done('text', 'inputs')
+    assert manifest.info('text', 'chars') == 5
+    assert manifest.info('text', 'pages') is None
+
+@pytest.mark.parametrize('pdf_path, expected', [
+    ('reports/Report.PDF', ('Report', 'reports/Report')),
+    ('reports/q1.v2.pdf', ('q1.v2', 'reports/q1.v2')),
+    ('q1.pdf', ('q1', 'q1')),
+])
+def test_output_dir_for(pdf_path, expected):
+    assert output_dir_for(pdf_path) == expected
@@ -0,0 +1,143 @@
+from privacy_index import DateIndex, InvertedIndex, NearDuplicateIndex
+
+STORY = ("Regulators fined the company after a breach exposed millions of customer records and passwords. "
+         "The company said attackers used stolen credentials to access a cloud database, and that affected "
+         "users will be notified by email over the coming weeks while an investigation continues.")
+COPY = STORY + " Updated."
+OTHER = "Court upholds right to be forgotten in landmark search engine ruling"
+
+
+def test_phrase_query_requires_adjacent_tokens():
+    index = InvertedIndex()
+    index.add('a', "Right to be forgotten ruling", "Court rules on data.")
+    index.add('b', "Data ruling", "The right of users to be careful with forgotten passwords.")
+    index.add('c', "Facial", "recognition in the content")
+
+    assert [doc_id for _, doc_id in index.search(['right to be forgotten'])] == ['a']
+    assert index.search(['facial recognition']) == []
+    assert {doc_id for _, doc_id in index.search(['forgotten'])} == {'a', 'b'}
+
+
+def test_queries_are_ored_and_title_terms_weigh_more():
+    index = InvertedIndex()
+    index.add('a', "Data breach", "passwords leaked")
+    index.add('b', "Weekly roundup", "another data breach, passwords leaked")
+    index.add('c', "GDPR fine", "regulator fines company")
+
+    assert [doc_id for _, doc_id in index.search(['data breach'])] == ['a', 'b']
+    assert {doc_id for _, doc_id in index.search(['data breach', 'gdpr'])} == {'a', 'b', 'c'}
+
+
+def test_removed_and_re_added_documents():
+    index = InvertedIndex()
+    index.add('a', "Data breach", "passwords leaked")
+    index.add('a', "Cookie banner", "consent rules")
+    assert index.search(['data breach']) == []
+    assert [doc_id for _, doc_id in index.search(['cookie'])] == ['a']
+
+    index.remove('a')
+    assert index.search(['cookie']) == []
+    assert len(index) == 0
+
+
+def make_date_index(n=10):
+    index = DateIndex()
+    for i in range(n):
+        index.add(f"doc{i}", f"2024-01-{i + 1:02d}T00:00:00")
+    return index
+
+
+def test_date_range_is_inclusive_and_newest_first():
+    index = make_date_index()
+    assert list(index.newest('2024-01-02', '2024-01-03')) == ['doc2', 'doc1']
+    assert list(index.newest(date_from='2024-01-09')) == ['doc9', 'doc8']
+    assert len(list(index.newest())) == 10
+
+
+def test_re_dating_a_document_moves_it():
+    index = make_date_index(3)
+    index.add('doc0', '2024-02-01T00:00:00')
+    index.remove('doc1')
+    assert list(index.newest()) == ['doc0', 'doc2']
+
+
+def test_before_returns_newest_first():
+    index = make_date_index()
+    keys = index.before(None, 3)
+    assert [doc_id for _, doc_id in keys] == ['doc9', 'doc8', 'doc7']
+    assert [doc_id for _, doc_id in index.before(keys[-1], 2)] == ['doc6', 'doc5']
+    assert index.before(('2024-01-01T00:00:00', 'doc0'), 5) == []
+
+
+def test_cursor_paging_is_stable_while_items_arrive():
+    index = make_date_index(25)
+    seen, cursor = [], None
+    while True:
+        keys = index.before(cursor, 4)
+        seen.extend(doc_id for _, doc_id in keys)
+        if len(keys) < 4:
+            break
+        cursor = keys[-1]
+        index.add(f"new{len(seen)}", '2024-03-01T00:00:00')  # Newer than every cursor
+
+    assert seen == [f"doc{i}" for i in range(24, -1, -1)]
+
+
+def test_cursor_paging_skips_rejected_docs():
+    index = make_date_index(25)
+    accept = lambda doc_id: int(doc_id[3:]) % 3 != 0
+    seen, cursor = [], None
+    while True:
+        keys = index.before(cursor, 4, accept=accept)
+        seen.extend(doc_id for _, doc_id in keys)
+        if len(keys) < 4:
+            break
+        cursor = keys[-1]
+
+    assert seen == [f"doc{i}" for i in range(24, -1, -1) if i % 3 != 0]
+
+
+def test_near_duplicates_share_a_cluster():
+    index = NearDuplicateIndex()
+    a = index.add('a', STORY)
+    b = index.add('b', COPY)
+    c = index.add('c', OTHER)
+
+    assert a == b != c
+    assert index.is_representative('a') and not index.is_representative('b')
+    assert index.size('b') == 2
+
+
+def test_re_adding_representative_keeps_members():
+    index = NearDuplicateIndex()
+    index.add('a', STORY)
+    index.add('b', COPY)
+    index.add('a', OTHER)
+
+    assert index.is_representative('b')
+    assert index.size('b') == 1
+    index.add('a', STORY)
+    assert index.size('a') == 2
+
+
+def test_remove_promotes_a_new_representative():
+    index = NearDuplicateIndex()
+    index.add('a', STORY)
+    index.add('b', COPY)
+    index.remove('a')
+
+    assert index.is_representative('b')
+    assert index.size('b') == 1
+
+
+def test_search_skips_rejected_docs():
+    index = InvertedIndex()
+    index.add('a', "Data breach", "passwords leaked")
+    index.add('b', "Data breach copy", "passwords leaked")
+    assert [doc_id for _, doc_id in index.search(['data breach'], accept=lambda doc_id: doc_id != 'a')] == ['b']
+
+
+def test_older_than_is_exclusive():
+    index = make_date_index()
+    assert index.older_than('2024-01-03') == ['doc0', 'doc1']
+    assert index.older_than('2024-01-01') == []
@@ -0,0 +1,216 @@
+import hashlib
+import http.server
+import threading
+
+import pytest
+import requests
+
+from privacy_policy import PolicyAnalyzer, PolicyTracker, is_public_host, open_url, policy_session
+
+POLICY = """<html><body><nav>Home | About</nav>
+<h2>Information we collect</h2><p>We collect your email address.</p>
+<h2>Sharing</h2><p>We do not sell your data.</p>
+</body></html>"""
+
+
+class PolicyServer(http.server.ThreadingHTTPServer):
+    """Serves self.body at /privacy with an ETag; other paths are 404s"""
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), PolicyHandler)
+        self.body = POLICY
+        self.requests = []  # (path, If-None-Match)
+        self.redirect_to = None
+
+    @property
+    def host(self):
+        return f"127.0.0.1:{self.server_address[1]}"
+
+
+class PolicyHandler(http.server.BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append((self.path, self.headers.get('If-None-Match')))
+        if self.path == '/redirect':
+            self.send_response(302)
+            self.send_header('Location', server.redirect_to)
+            self.end_headers()
+            return
+        if self.path != '/privacy':
+            self.send_error(404)
+            return
+        body = server.body.encode()
+        etag = '"' + hashlib.sha256(body).hexdigest()[:16] + '"'
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('ETag', etag)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def server():
+    server = PolicyServer()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def tracker(tmp_path):
+    return PolicyTracker(tmp_path, interval=0, scheme='http', workers=2, allow_private=True)
+
+
+def test_track_defers_the_first_check(server, tracker):
+    record = tracker.track(f"http://{server.host}/")
+    assert record['domain'] == server.host
+    assert record['snapshots'] == []
+    assert server.requests == []
+
+
+def test_snapshot_then_not_modified(server, tracker):
+    tracker.track(server.host)
+    record = tracker.check(server.host)
+
+    assert record['url'] == f"http://{server.host}/privacy"
+    assert record['last_error'] is None
+    assert len(record['snapshots']) == 1
+    text = tracker.get_object(record['snapshots'][0]['hash'])
+    assert '## Sharing' in text and 'Home' not in text
+
+    record = tracker.check(server.host)
+    assert len(record['snapshots']) == 1
+    assert server.requests[-1] == ('/privacy', record['etag'])
+
+
+def test_changed_policy_is_diffed(server, tracker):
+    tracker.track(server.host)
+    assert tracker.check_due() == []
+
+    server.body = POLICY.replace('do not sell', 'sell').replace(
+        '</body>', '<h2>Retention</h2><p>We keep data for 5 years.</p></body>')
+    assert tracker.check_due() == [server.host]
+
+    record = tracker.load(server.host)
+    diff = record['snapshots'][-1]['diff']
+    assert diff['added_lines'] == 3 and diff['removed_lines'] == 1
+    assert diff['sections_added'] == ['Retention']
+    assert diff['sections_changed'] == ['Sharing']
+    assert record['last_changed'] == record['last_checked']
+
+
+def test_history_is_shared_through_the_snapshot_dir(server, tmp_path, tracker):
+    tracker.track(server.host)
+    tracker.check(server.host)
+
+    other = PolicyTracker(tmp_path, interval=0, scheme='http', allow_private=True)
+    server.body = POLICY.replace('email address', 'email address and location')
+    other.check(server.host)
+    tracker.check(server.host)
+
+    assert len(tracker.load(server.host)['snapshots']) == 2
+
+
+def test_unreachable_policy_records_the_error(server, tracker):
+    tracker.track(server.host)
+    tracker.check(server.host)
+    server.shutdown()
+    server.server_close()
+
+    record = tracker.check(server.host)
+    assert record['last_error']
+    assert len(record['snapshots']) == 1
+
+
+
+def test_track_refuses_domains_past_the_limit(tmp_path):
+    tracker = PolicyTracker(tmp_path, max_domains=2)
+    tracker.track('a.example.com')
+    tracker.track('b.example.com')
+    with pytest.raises(ValueError, match='maximum of 2'):
+        tracker.track('c.example.com')
+    # Already tracked domains still answer, also from another process's view
+    assert PolicyTracker(tmp_path, max_domains=2).track('a.example.com')['domain'] == 'a.example.com'
+    assert tracker.domains() == ['a.example.com', 'b.example.com']
+
+@pytest.mark.parametrize('domain', ['localhost', 'printer.local', '10.0.0.1', 'example.com:8080', 'a b.com', ''])
+def test_internal_domains_are_refused(tmp_path, domain):
+    with pytest.raises(ValueError):
+        PolicyTracker(tmp_path).normalize_domain(domain)
+
+
+def test_normalize_domain(tmp_path):
+    assert PolicyTracker(tmp_path).normalize_domain(' HTTPS://Example.COM/privacy ') == 'example.com'
+
+
+@pytest.mark.parametrize('host', ['127.0.0.1', '10.1.2.3', '169.254.169.254', '::1', 'localhost'])
+def test_non_public_hosts(host):
+    assert not is_public_host(host)
+
+
+def test_redirects_to_internal_hosts_are_refused(server, monkeypatch):
+    import privacy_policy
+    server.redirect_to = 'http://169.254.169.254/latest/meta-data/'
+    # Treat the test server itself as public so the redirect is what gets refused
+    monkeypatch.setattr(privacy_policy, 'is_public_host', lambda host: host == '127.0.0.1')
+
+    with pytest.raises(ValueError, match='169.254.169.254'):
+        open_url(requests.Session(), f"http://{server.host}/redirect")
+    assert server.requests == [('/redirect', None)]
+
+
+
+def test_rebound_hosts_are_refused_at_connect(server, monkeypatch):
+    import privacy_policy
+    # The name check passes, but the connection still lands on loopback
+    monkeypatch.setattr(privacy_policy, 'is_public_host', lambda host: True)
+
+    with pytest.raises(ValueError, match='resolved to 127.0.0.1'):
+        open_url(policy_session('test'), f"http://{server.host}/privacy")
+    assert server.requests == []
+
+    _, resp = open_url(policy_session('test', allow_private=True), f"http://{server.host}/privacy")
+    assert resp.status_code == 200
+    resp.close()
+
+@pytest.fixture
+def analyzer():
+    return PolicyAnalyzer(workers=1)
+
+
+@pytest.mark.parametrize('text', [
+    'We are transparent about the information we hold.',
+    'Different data is kept in current systems.',
+    "Parents can review their child's data.",
+])
+def test_rules_match_whole_words_only(analyzer, text):
+    analysis, _ = analyzer.analyze_text(text)
+    assert analysis['findings'] == []
+
+
+@pytest.mark.parametrize('text', [
+    'We do not sell or rent your personal information.',
+    "We don't sell, rent or trade your data.",
+    'We will never sell personal information.',
+])
+def test_negated_selling_is_protective(analyzer, text):
+    analysis, _ = analyzer.analyze_text(text)
+    assert analysis['scores']['sharing'] == -3
+    assert len(analysis['findings']) == 1
+
+
+def test_selling_data_is_invasive(analyzer):
+    analysis, cached = analyzer.analyze_text('We may sell your personal information to partners.')
+    assert not cached
+    assert analysis['scores']['sharing'] == 3
+    assert analysis['findings'][0]['phrase'] == 'sell your personal information'
+    assert analyzer.analyze_text('We may sell your personal information to partners.') == (analysis, True)
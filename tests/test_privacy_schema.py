@@ -0,0 +1,63 @@
+import math
+
+import pytest
+
+from privacy_schema import compile_schema
+
+SCHEMA = {
+    'type': 'object',
+    'properties': {
+        'query': {'type': 'string', 'minLength': 1, 'maxLength': 10},
+        'limit': {'type': 'integer', 'default': 50, 'minimum': 1, 'maximum': 100},
+        'score': {'type': 'number', 'minimum': 0, 'maximum': 1},
+        'stream': {'type': 'boolean', 'default': False},
+        'urls': {'type': 'array', 'items': {'type': 'string'}, 'maxItems': 2},
+    },
+    'required': ['query'],
+}
+
+
+@pytest.fixture
+def validate():
+    return compile_schema(SCHEMA)
+
+
+def test_defaults_are_filled_and_unknown_properties_dropped(validate):
+    assert validate({'query': 'gdpr', 'extra': 1}) == {'query': 'gdpr', 'limit': 50, 'stream': False}
+
+
+@pytest.mark.parametrize('arguments, message', [
+    ([], 'arguments must be an object'),
+    ({}, 'Missing required argument: query'),
+    ({'query': None}, 'Missing required argument: query'),
+    ({'query': 5}, 'query must be of type string'),
+    ({'query': 'a', 'limit': '10'}, 'limit must be of type integer'),
+    ({'query': 'a', 'limit': True}, 'limit must be of type integer'),
+    ({'query': 'a', 'limit': 2.5}, 'limit must be an integer'),
+    ({'query': 'a', 'stream': 1}, 'stream must be of type boolean'),
+    ({'query': ''}, 'query is too short'),
+    ({'query': 'x' * 11}, 'query is too long'),
+    ({'query': 'a', 'urls': ['a', 'b', 'c']}, 'urls has too many items'),
+    ({'query': 'a', 'urls': ['a', 1]}, 'urls items must be of type string'),
+])
+def test_invalid_arguments(validate, arguments, message):
+    with pytest.raises(ValueError, match=message):
+        validate(arguments)
+
+
+@pytest.mark.parametrize('limit, expected', [(0, 1), (-5, 1), (1000, 100), (7.0, 7), (10 ** 400, 100), (-10 ** 400, 1)])
+def test_integers_are_clamped(validate, limit, expected):
+    value = validate({'query': 'a', 'limit': limit})['limit']
+    assert value == expected and type(value) is int
+
+
+@pytest.mark.parametrize('score, expected', [(0.5, 0.5), (-1, 0), (2.5, 1), (10 ** 400, 1)])
+def test_numbers_are_clamped(validate, score, expected):
+    assert validate({'query': 'a', 'score': score})['score'] == expected
+
+
+@pytest.mark.parametrize('prop', ['limit', 'score'])
+@pytest.mark.parametrize('value', [math.inf, -math.inf, math.nan])
+def test_non_finite_numbers_are_rejected(validate, prop, value):
+    with pytest.raises(ValueError, match='must be a finite number'):
+        validate({'query': 'a', prop: value})
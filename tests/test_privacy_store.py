@@ -0,0 +1,73 @@
+import sqlite3
+
+import pytest
+
+from privacy_store import SOURCE_FIELDS, ItemStore
+
+
+def item(doc_id, published, title='t'):
+    return {'id': doc_id, 'source': 'src', 'published': published, 'title': title}
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ItemStore(tmp_path / 'items.db')
+
+
+def test_changed_since_follows_write_order(store):
+    assert store.changed_since(0.0) == ([], 0.0)
+
+    store.upsert([item('a', '2025-01-02T00:00:00'), item('b', '2025-01-01T00:00:00')])
+    items, watermark = store.changed_since(0.0)
+    assert [i['id'] for i in items] == ['b', 'a']
+    assert watermark > 0
+    assert store.changed_since(watermark) == ([], watermark)
+
+    # A rewritten item comes back after the watermark, with its new data
+    store.upsert([item('a', '2025-01-02T00:00:00', title='edited'), item('c', '2024-12-31T00:00:00')])
+    items, later = store.changed_since(watermark)
+    assert [(i['id'], i['title']) for i in items] == [('c', 't'), ('a', 'edited')]
+    assert later > watermark
+    assert len(store.changed_since(0.0)[0]) == 3
+
+
+def test_prune_deletes_items_published_before_the_cutoff(store):
+    store.upsert([item('old', '2024-06-30T23:59:59'), item('edge', '2024-07-01'), item('new', '2024-08-01T00:00:00')])
+    store.prune('2024-07-01')
+    store.compact()
+    assert sorted(i['id'] for i in store.changed_since(0.0)[0]) == ['edge', 'new']
+    assert store.size_bytes() > 0
+
+
+def test_source_state_round_trip(store):
+    assert store.load_source('src') is None
+    state = {'etag': '"v1"', 'last_modified': 'Mon, 06 Jan 2025 10:00:00 GMT', 'last_success': 100.0,
+             'last_checked': 100.0, 'last_status': 200, 'last_error': None, 'next_due': 1900.0, 'in_flight': True}
+    store.save_source('src', state)
+    assert store.load_source('src') == {field: state[field] for field in SOURCE_FIELDS}
+
+    store.save_source('src', {**state, 'etag': None, 'last_status': None, 'last_error': 'timeout'})
+    saved = store.load_source('src')
+    assert (saved['etag'], saved['last_status'], saved['last_error']) == (None, None, 'timeout')
+
+
+def test_sources_from_older_stores_are_migrated(tmp_path):
+    path = tmp_path / 'items.db'
+    conn = sqlite3.connect(path)
+    conn.execute('CREATE TABLE sources (name TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, last_success REAL)')
+    conn.execute("INSERT INTO sources VALUES ('src', '\"v1\"', NULL, 100.0)")
+    conn.commit()
+    conn.close()
+
+    saved = ItemStore(path).load_source('src')
+    # No next_due yet, so the source is due as soon as it is registered
+    assert 'next_due' not in saved
+    assert (saved['etag'], saved['last_success'], saved['last_checked']) == ('"v1"', 100.0, None)
+
+
+def test_refresh_requests_are_claimed_once(store):
+    assert store.take_refresh_request() is None
+    store.request_refresh()
+    store.request_refresh(force=True)
+    assert store.take_refresh_request() is True
+    assert store.take_refresh_request() is None
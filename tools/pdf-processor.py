@@ -12,6 +12,7 @@ Requirements:
     
 Usage:
     python3 pdf-processor.py ~/Downloads/ark-big-ideas-2026.pdf
+    python3 pdf-processor.py ~/Reports/ 'archive/**/*.pdf' --report run.json   # batch
     
 Output:
     ark-big-ideas-2026/
@@ -19,15 +20,27 @@ Output:
     ├── full-text.txt       # All text
     ├── sections.json       # Chunked sections
     ├── images/             # Extracted images
+    ├── analysis.jsonl      # Ollama analysis, appended as sections finish
     ├── analysis.json       # Ollama analysis per section
-    └── summary.json        # Final structured output
+    ├── summary.json        # Final structured output
+    └── manifest.json       # Step/section checkpoints; reruns resume from here
 """
 
 import subprocess
+import argparse
+import glob
+import hashlib
+import http.client
 import json
 import os
 import sys
 import re
+import sqlite3
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
 
@@ -35,17 +48,38 @@ from pathlib import Path
 # CONFIG
 # =============================================================================
 
-CHUNK_SIZE = 3000  # Characters per chunk for Ollama
+CONTEXT_TOKENS = int(os.environ.get('OLLAMA_NUM_CTX', 4096))  # Model context window (sent as num_ctx)
+RESPONSE_TOKENS = 768  # Context reserved for the model's answer
+CHUNK_OVERLAP_TOKENS = 150  # Tokens repeated from the previous chunk of the same section
+TOKENIZER = os.environ.get('PDF_PROCESSOR_TOKENIZER', 'approx')  # approx, tiktoken[:encoding], hf:<model>
 OLLAMA_MODEL = "llama2"  # Change to mistral, llama3, etc.
+OLLAMA_URL = os.environ.get('OLLAMA_HOST', 'http://localhost:11434')  # Ollama HTTP API
+OLLAMA_WORKERS = 4  # Sections in flight at once (match OLLAMA_NUM_PARALLEL)
+OLLAMA_TIMEOUT = 300  # Seconds to wait for the next streamed token
+OLLAMA_KEEP_ALIVE = "30m"  # How long the server keeps the model loaded between requests
+OLLAMA_RETRIES = 3  # Attempts per section before giving up
+OLLAMA_BACKOFF = 2  # Seconds before first retry, doubled each time
+PROMPT_VERSION = 1  # Bump when a prompt template changes to invalidate cached answers
+CACHE_PATH = os.path.expanduser(os.environ.get('PDF_PROCESSOR_CACHE', '~/.cache/pdf-processor/analysis.db'))
+CACHE_MAX_BYTES = 256 * 1024 * 1024  # Least recently used answers are evicted past this (0 disables)
+CACHE_RECOUNT_EVERY = 100  # Inserts between exact size recounts
 MAX_CHUNKS_TO_PROCESS = 50  # Limit for testing (set to None for all)
+EXTRACT_WORKERS = os.cpu_count() or 1  # Processes for page-range text extraction
+MIN_PAGES_PER_JOB = 4  # Don't split extraction finer than this
+BATCH_EXTRACT_WORKERS = 2  # Batch mode: PDFs extracted at once (each splits EXTRACT_WORKERS)
+BATCH_ANALYZE_WORKERS = 2  # Batch mode: PDFs analyzed at once (each with OLLAMA_WORKERS requests)
 
 # =============================================================================
 # HELPERS
 # =============================================================================
 
 def run(cmd, capture=True):
-    """Run shell command"""
-    result = subprocess.run(cmd, shell=True, capture_output=capture, text=True)
+    """Run command (argument list, no shell)"""
+    try:
+        result = subprocess.run(cmd, capture_output=capture, text=True)
+    except FileNotFoundError:
+        print(f"  {cmd[0]} not found")
+        return '' if capture else 127
     return result.stdout.strip() if capture else result.returncode
 
 def ensure_dir(path):
@@ -62,7 +96,7 @@ def get_pdf_info(pdf_path):
     info = {}
     
     # Basic info from pdfinfo
-    output = run(f'pdfinfo "{pdf_path}"')
+    output = run(['pdfinfo', pdf_path])
     for line in output.split('\n'):
         if ':' in line:
             key, val = line.split(':', 1)
@@ -70,20 +104,80 @@ def get_pdf_info(pdf_path):
     
     return info
 
-def extract_text(pdf_path, output_dir):
-    """Extract all text from PDF"""
+def load_pymupdf():
+    """PyMuPDF module, or None if not installed"""
+    try:
+        import pymupdf
+        return pymupdf
+    except ImportError:
+        try:
+            import fitz
+            return fitz
+        except ImportError:
+            return None
+
+def page_count(pdf_path, metadata=None):
+    """Number of pages, from pdfinfo metadata or PyMuPDF"""
+    pages = (metadata or {}).get('pages', '')
+    if str(pages).isdigit():
+        return int(pages)
+    pymupdf = load_pymupdf()
+    if pymupdf:
+        with pymupdf.open(pdf_path) as doc:
+            return doc.page_count
+    return 0
+
+def extract_page_range(pdf_path, first, last):
+    """Extract text for pages first..last (1-based, inclusive), one form feed per page"""
+    pymupdf = load_pymupdf()
+    if pymupdf:
+        with pymupdf.open(pdf_path) as doc:
+            return ''.join(doc[i].get_text() + '\f' for i in range(first - 1, last))
+    
+    result = subprocess.run(
+        ['pdftotext', '-layout', '-f', str(first), '-l', str(last), pdf_path, '-'],
+        capture_output=True, text=True, errors='ignore'
+    )
+    return result.stdout
+
+def page_ranges(pages, workers=EXTRACT_WORKERS):
+    """Split 1..pages into about two contiguous ranges per worker"""
+    size = max(MIN_PAGES_PER_JOB, -(-pages // (workers * 2)))
+    return [(first, min(first + size - 1, pages)) for first in range(1, pages + 1, size)]
+
+def extract_text(pdf_path, output_dir, pages=0, workers=EXTRACT_WORKERS):
+    """
+    Extract all text from PDF
+    
+    Page ranges are extracted in parallel worker processes (PyMuPDF if
+    installed, otherwise pdftotext -f/-l) and stitched back in page order.
+    """
     txt_path = f"{output_dir}/full-text.txt"
-    run(f'pdftotext -layout "{pdf_path}" "{txt_path}"')
+    ranges = page_ranges(pages, workers) if pages else []
+    
+    if len(ranges) > 1 and workers > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(ranges))) as pool:
+            parts = pool.map(extract_page_range,
+                             [pdf_path] * len(ranges),
+                             [first for first, _ in ranges],
+                             [last for _, last in ranges])
+            text = ''.join(parts)
+    elif ranges:
+        text = extract_page_range(pdf_path, 1, pages)
+    else:
+        # Page count unknown: one pass over the whole document
+        text = subprocess.run(['pdftotext', '-layout', pdf_path, '-'],
+                              capture_output=True, text=True, errors='ignore').stdout
     
-    with open(txt_path, 'r', errors='ignore') as f:
-        text = f.read()
+    with open(txt_path, 'w') as f:
+        f.write(text)
     
     return text
 
 def extract_images(pdf_path, output_dir):
     """Extract all images from PDF"""
     img_dir = ensure_dir(f"{output_dir}/images")
-    run(f'pdfimages -png "{pdf_path}" "{img_dir}/img"')
+    run(['pdfimages', '-png', pdf_path, f"{img_dir}/img"])
     
     # List extracted images
     images = []
@@ -110,77 +204,398 @@ def chunk_by_pages(text):
     pages = text.split('\f')
     return [p.strip() for p in pages if p.strip()]
 
-def chunk_by_headers(text):
-    """Try to split by section headers (ALL CAPS lines)"""
-    lines = text.split('\n')
-    chunks = []
-    current_chunk = []
-    current_header = "Introduction"
-    
-    for line in lines:
-        # Detect headers (lines that are mostly uppercase, 3+ words)
-        stripped = line.strip()
-        if (stripped.isupper() and 
-            len(stripped) > 10 and 
-            len(stripped.split()) >= 2 and
-            not stripped.startswith('©')):
-            # Save previous chunk
-            if current_chunk:
-                chunks.append({
-                    "header": current_header,
-                    "content": '\n'.join(current_chunk)
-                })
-            current_header = stripped
-            current_chunk = []
+def is_header(line):
+    """Section header: mostly uppercase line, 2+ words"""
+    return (line.isupper() and
+            len(line) > 10 and
+            len(line.split()) >= 2 and
+            not line.startswith('©'))
+
+WORD_RE = re.compile(r"\w+|[^\w\s]")
+
+def approx_tokens(text):
+    """Offline token estimate: one per word or symbol, plus one per 6 letters of long words"""
+    return sum(1 + len(w) // 6 for w in WORD_RE.findall(text))
+
+@lru_cache(maxsize=None)
+def get_tokenizer(name=TOKENIZER):
+    """
+    Token counter (text -> int) by name
+    
+    approx          built-in estimate, no dependencies
+    tiktoken[:enc]  tiktoken encoding (default cl100k_base)
+    hf:<model>      Hugging Face tokenizer, e.g. hf:meta-llama/Llama-2-7b-hf
+    """
+    if name == 'approx':
+        return approx_tokens
+    if name.split(':')[0] == 'tiktoken':
+        import tiktoken
+        encoding = tiktoken.get_encoding(name.partition(':')[2] or 'cl100k_base')
+        return lambda text: len(encoding.encode(text, disallowed_special=()))
+    if name.startswith('hf:'):
+        from transformers import AutoTokenizer
+        tokenizer = AutoTokenizer.from_pretrained(name[3:])
+        return lambda text: len(tokenizer.encode(text, add_special_tokens=False))
+    raise ValueError(f"Unknown tokenizer: {name}")
+
+def chunk_token_budget(count_tokens):
+    """Tokens of section text that fit beside the prompt and the answer"""
+    return CONTEXT_TOKENS - RESPONSE_TOKENS - count_tokens(SECTION_PROMPT.format(section_text=''))
+
+def split_line(line, max_tokens, count_tokens):
+    """Break a line longer than max_tokens at word boundaries"""
+    n = count_tokens(line)
+    if n <= max_tokens:
+        return [(line, n)]
+    words = line.split(' ')
+    if len(words) == 1:
+        half = len(line) // 2  # One giant "word": split by characters
+        left, right = line[:half], line[half:]
+    else:
+        left, right = ' '.join(words[:len(words) // 2]), ' '.join(words[len(words) // 2:])
+    return split_line(left, max_tokens, count_tokens) + split_line(right, max_tokens, count_tokens)
+
+def iter_chunks(lines, max_tokens=None, overlap=CHUNK_OVERLAP_TOKENS, count_tokens=None):
+    """
+    Split a stream of text lines into token-budgeted chunks in a single pass
+    
+    Consecutive sections (split at ALL CAPS header lines) are packed into
+    one chunk while they fit in max_tokens, each keeping its header line in
+    the content as a label, so a deck of short slides does not turn into a
+    model call per slide. When the budget runs out the chunk is cut at the
+    last section, paragraph or page break that fits (or at a line if there
+    is none). A cut inside a section repeats up to overlap tokens of its
+    trailing lines at the start of the next chunk. Text is never truncated.
+    Chunks are yielded as soon as they close, so the text never has to be
+    held in memory as a whole.
+    
+    Args:
+        lines: Iterable of lines (e.g. an open full-text.txt)
+        max_tokens: Tokens per chunk (default: what fits in CONTEXT_TOKENS)
+        overlap: Tokens carried over between chunks of one section
+        count_tokens: Tokenizer callable (default get_tokenizer())
+    
+    Yields:
+        {"header", "content", "tokens"}; the header names the chunk's first
+        section ("HEADER (part n)" if it started in an earlier chunk) and
+        "(+n more)" when further sections were merged in
+    """
+    count_tokens = count_tokens or get_tokenizer()
+    max_tokens = max_tokens or chunk_token_budget(count_tokens)
+    overlap = min(overlap, max_tokens // 4)
+    
+    sections = [None]  # Headers in order; text before the first one is section 0
+    parts = {}  # Section -> chunks it has appeared in so far
+    count = 0
+    buf = []  # (line, tokens, section, is_header); ('', 0, ...) marks a paragraph break
+    total = 0
+    carried = 0  # Leading buf entries repeated from the previous chunk
+    
+    def cut(end, carry):
+        """Close buf[:end] as a chunk, keeping buf[end:] (after any overlap) for the next"""
+        nonlocal buf, total, carried, count
+        body, rest = buf[:end], buf[end:]
+        spanned = list(dict.fromkeys(section for line, _, section, _ in body[carried:] if line))
+        tail = []
+        if carry:
+            kept = 0
+            for entry in reversed(body):
+                if kept + entry[1] > overlap:
+                    break
+                tail.append(entry)
+                kept += entry[1]
+            tail.reverse()
+            while tail and not tail[0][0]:
+                tail.pop(0)
+        while rest and not rest[0][0]:
+            rest.pop(0)
+        buf, carried = tail + rest, len(tail)
+        total = sum(entry[1] for entry in buf)
+        
+        if not spanned:
+            return None  # Nothing beyond the overlap
+        count += 1
+        for section in spanned:
+            parts[section] = parts.get(section, 0) + 1
+        first = spanned[0]
+        if sections[first] is None:
+            label = f"Section {count}"
         else:
-            current_chunk.append(line)
+            label = sections[first] if parts[first] == 1 else f"{sections[first]} (part {parts[first]})"
+        if len(spanned) > 1:
+            label += f" (+{len(spanned) - 1} more)"
+        content = '\n'.join(entry[0] for entry in body).strip()
+        return {"header": label, "content": content, "tokens": sum(entry[1] for entry in body)}
     
-    # Don't forget last chunk
-    if current_chunk:
-        chunks.append({
-            "header": current_header,
-            "content": '\n'.join(current_chunk)
-        })
+    def add(line, n, is_section_header=False):
+        """Append a line, closing chunks first if it would not fit"""
+        nonlocal buf, total, carried
+        closed = []
+        while total + n > max_tokens and len(buf) > carried:
+            breaks = [i for i in range(carried + 1, len(buf)) if not buf[i][0] or buf[i][3]]
+            end = breaks[-1] if breaks else len(buf)
+            # No overlap across a section boundary
+            closed.append(cut(end, carry=end == len(buf) or not buf[end][3]))
+        if total + n > max_tokens:
+            buf, total, carried = [], 0, 0  # Overlap alone leaves no room
+        buf.append((line, n, len(sections) - 1, is_section_header))
+        total += n
+        return [chunk for chunk in closed if chunk]
+    
+    def paragraph_break():
+        if len(buf) > carried and buf[-1][0]:
+            buf.append(('', 0, len(sections) - 1, False))
+    
+    for raw in lines:
+        # Page breaks (form feeds) end a paragraph like a blank line
+        for page_break, line in enumerate(raw.rstrip('\n').split('\f')):
+            stripped = line.strip()
+            if is_header(stripped):
+                n = count_tokens(stripped)
+                if total + n > max_tokens:
+                    chunk = cut(len(buf), carry=False)
+                    if chunk:
+                        yield chunk
+                sections.append(stripped)
+                paragraph_break()
+                yield from add(stripped, n, is_section_header=True)
+                continue
+            if page_break or not stripped:
+                paragraph_break()
+            if stripped:
+                for piece, n in split_line(line, max_tokens, count_tokens):
+                    yield from add(piece, n)
     
-    return chunks
+    chunk = cut(len(buf), carry=False)
+    if chunk:
+        yield chunk
 
-def chunk_by_size(text, size=CHUNK_SIZE):
-    """Split into fixed-size chunks"""
-    chunks = []
+def tee_json_array(items, path):
+    """Pass items through while streaming them to path as a JSON array"""
+    with open(path, 'w') as f:
+        f.write('[')
+        for i, item in enumerate(items):
+            f.write((',\n' if i else '\n') + '  ' + json.dumps(item, indent=2).replace('\n', '\n  '))
+            yield item
+        f.write('\n]\n')
+
+# =============================================================================
+# ANALYSIS CACHE
+# =============================================================================
+
+class AnalysisCache:
+    """
+    Model answers persisted in SQLite, keyed by (model, prompt version, prompt hash)
     
-    # Try to break at paragraph boundaries
-    paragraphs = text.split('\n\n')
-    current = ""
+    Shared across runs and PDFs, so unchanged sections of a re-processed
+    report are answered without calling the model. Bounded to max_bytes by
+    evicting least recently used entries. The size is tracked as a running
+    total, recounted every CACHE_RECOUNT_EVERY inserts (other processes
+    write to the same file) and before anything is evicted.
+    """
     
-    for para in paragraphs:
-        if len(current) + len(para) > size:
-            if current:
-                chunks.append(current.strip())
-            current = para
-        else:
-            current += "\n\n" + para
+    def __init__(self, path=CACHE_PATH, max_bytes=CACHE_MAX_BYTES):
+        ensure_dir(os.path.dirname(path) or '.')
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute("""CREATE TABLE IF NOT EXISTS answers (
+            key TEXT PRIMARY KEY,
+            response TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            used_at REAL NOT NULL
+        )""")
+        self.conn.execute('CREATE INDEX IF NOT EXISTS answers_used_at ON answers (used_at)')
+        self.total = self._recount()
+        self.inserts = 0
     
-    if current.strip():
-        chunks.append(current.strip())
+    def _recount(self):
+        return self.conn.execute('SELECT COALESCE(SUM(size), 0) FROM answers').fetchone()[0]
     
-    return chunks
+    @staticmethod
+    def key(model, prompt):
+        return hashlib.sha256(f"{model}\0{PROMPT_VERSION}\0{prompt}".encode()).hexdigest()
+    
+    def get(self, key):
+        with self.lock, self.conn:
+            row = self.conn.execute('SELECT response FROM answers WHERE key = ?', (key,)).fetchone()
+            if row:
+                self.conn.execute('UPDATE answers SET used_at = ? WHERE key = ?', (time.time(), key))
+        return row[0] if row else None
+    
+    def put(self, key, response):
+        size = len(key) + len(response.encode())
+        with self.lock, self.conn:
+            old = self.conn.execute('SELECT size FROM answers WHERE key = ?', (key,)).fetchone()
+            self.conn.execute('INSERT OR REPLACE INTO answers VALUES (?, ?, ?, ?)',
+                              (key, response, size, time.time()))
+            self.total += size - (old[0] if old else 0)
+            self.inserts += 1
+            if self.total > self.max_bytes or self.inserts % CACHE_RECOUNT_EVERY == 0:
+                self.total = self._recount()
+            if self.total > self.max_bytes:
+                # Walk oldest first and drop until back under budget
+                doomed = []
+                for old_key, old_size in self.conn.execute('SELECT key, size FROM answers ORDER BY used_at'):
+                    if self.total <= self.max_bytes:
+                        break
+                    doomed.append((old_key,))
+                    self.total -= old_size
+                self.conn.executemany('DELETE FROM answers WHERE key = ?', doomed)
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_cache():
+    """Shared AnalysisCache, or None when caching is disabled"""
+    global _cache
+    if not CACHE_MAX_BYTES:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = AnalysisCache()
+        return _cache
 
 # =============================================================================
 # OLLAMA INTEGRATION
 # =============================================================================
 
+class OllamaError(Exception):
+    """Ollama server returned an error"""
+
+OLLAMA_ERRORS = (OSError, http.client.HTTPException, ValueError, OllamaError)
+
+class OllamaClient:
+    """
+    Streaming client for the Ollama HTTP API
+    
+    Each thread keeps one HTTP/1.1 connection open and reuses it for every
+    request, and keep_alive holds the model in memory between sections, so
+    there is no process spawn or model reload per call. Prompts travel in
+    the request body, never on a command line.
+    """
+    
+    def __init__(self, url=OLLAMA_URL, keep_alive=OLLAMA_KEEP_ALIVE, timeout=OLLAMA_TIMEOUT, num_ctx=CONTEXT_TOKENS):
+        url = url if '://' in url else f"http://{url}"
+        scheme, _, netloc = url.rstrip('/').partition('://')
+        self.connection_class = http.client.HTTPSConnection if scheme == 'https' else http.client.HTTPConnection
+        self.netloc = netloc
+        self.keep_alive = keep_alive
+        self.timeout = timeout
+        self.num_ctx = num_ctx
+        self.local = threading.local()
+    
+    def _connection(self):
+        conn = getattr(self.local, 'conn', None)
+        if conn is None:
+            conn = self.local.conn = self.connection_class(self.netloc, timeout=self.timeout)
+        return conn
+    
+    def _reset(self):
+        conn = getattr(self.local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self.local.conn = None
+    
+    def _post(self, path, payload):
+        body = json.dumps(payload).encode()
+        headers = {"Content-Type": "application/json"}
+        while True:
+            conn = self._connection()
+            reused = conn.sock is not None
+            try:
+                conn.request('POST', path, body, headers)
+                return conn.getresponse()
+            except (BrokenPipeError, ConnectionResetError):
+                # Includes RemoteDisconnected: the server closed an idle
+                # keep-alive connection, so resend on a new one. A failure on
+                # a fresh connection, or a timeout while the model is still
+                # generating, is left to the caller's retry policy.
+                self._reset()
+                if not reused:
+                    raise
+            except BaseException:
+                self._reset()
+                raise
+    
+    def stream(self, prompt, model=OLLAMA_MODEL):
+        """Yield response tokens as the model generates them"""
+        response = self._post('/api/generate', {
+            "model": model,
+            "prompt": prompt,
+            "stream": True,
+            "keep_alive": self.keep_alive,
+            # Cap answers so merged analyses always fit the next prompt
+            "options": {"num_ctx": self.num_ctx, "num_predict": RESPONSE_TOKENS},
+        })
+        try:
+            if response.status != 200:
+                raise OllamaError(f"HTTP {response.status}: {response.read().decode(errors='replace')[:200]}")
+            for line in response:
+                if not line.strip():
+                    continue
+                message = json.loads(line)
+                if message.get('error'):
+                    raise OllamaError(message['error'])
+                yield message.get('response', '')
+                if message.get('done'):
+                    break
+            response.read()  # Drain so the connection can be reused
+        except BaseException:
+            self._reset()
+            raise
+    
+    def generate(self, prompt, model=OLLAMA_MODEL, on_token=None):
+        """Full response text; on_token(token) is called as tokens arrive"""
+        tokens = []
+        for token in self.stream(prompt, model):
+            tokens.append(token)
+            if on_token:
+                on_token(token)
+        return ''.join(tokens).strip()
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_client():
+    """Shared OllamaClient"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = OllamaClient()
+        return _client
+
 def ask_ollama(prompt, model=OLLAMA_MODEL):
     """Send prompt to Ollama"""
-    # Escape for shell
-    escaped = prompt.replace("'", "'\\''")
-    result = run(f"ollama run {model} '{escaped}'")
-    return result
+    return get_client().generate(prompt, model)
+
+def ask_with_retry(prompt, model=OLLAMA_MODEL, retries=OLLAMA_RETRIES):
+    """ask_ollama, retrying failures with exponential backoff"""
+    for attempt in range(retries):
+        try:
+            return ask_ollama(prompt, model)
+        except OLLAMA_ERRORS as e:
+            if attempt == retries - 1:
+                raise
+            delay = OLLAMA_BACKOFF * 2 ** attempt
+            print(f"  Ollama request failed ({e}), retrying in {delay}s...")
+            time.sleep(delay)
 
-def analyze_section(section_text, section_num, total_sections):
-    """Analyze a single section with Ollama"""
-    print(f"  Analyzing section {section_num}/{total_sections}...")
+def ask_cached(prompt, model=OLLAMA_MODEL):
+    """ask_with_retry behind the analysis cache"""
+    cache = get_cache()
+    if cache is None:
+        return ask_with_retry(prompt, model)
     
-    prompt = f"""Analyze this section from an investment research report. Extract:
+    key = cache.key(model, prompt)
+    response = cache.get(key)
+    if response is None:
+        response = ask_with_retry(prompt, model)
+        cache.put(key, response)
+    return response
+
+SECTION_PROMPT = """Analyze this section from an investment research report. Extract:
 
 1. TOPIC: Main subject (1 line)
 2. KEY_POINTS: Important insights (3-5 bullets)
@@ -192,23 +607,65 @@ def analyze_section(section_text, section_num, total_sections):
 Be concise. Return structured text, not JSON.
 
 SECTION TEXT:
-{section_text[:2500]}
+{section_text}
 """
+
+def analyze_section(section_text, section_num, total_sections=None):
+    """Analyze a single section with Ollama (cached)"""
+    print(f"  Analyzing section {section_num}/{total_sections}..." if total_sections
+          else f"  Analyzing section {section_num}...")
     
-    response = ask_ollama(prompt)
+    prompt = SECTION_PROMPT.format(section_text=section_text)
+    
+    response = ask_cached(prompt)
     return response
 
-def generate_summary(all_analyses, pdf_name):
-    """Generate overall summary from all section analyses"""
-    print("Generating overall summary...")
+def analyze_sections(sections, workers=OLLAMA_WORKERS):
+    """
+    Analyze sections concurrently, keeping section order
+    
+    Sections are pulled from the iterable only as workers free up (at most
+    two per worker queued), so a lazy chunker feeds analysis directly.
     
-    # Combine key points from all sections
-    combined = "\n\n---\n\n".join([
-        f"Section {i+1}:\n{a}" 
-        for i, a in enumerate(all_analyses[:20])  # Limit context
-    ])
+    Args:
+        sections: Iterable of {"section", "header", "content"}
+        workers: Requests in flight at once
     
-    prompt = f"""Based on these section analyses from the {pdf_name} research report, create:
+    Yields:
+        {"section", "header", "analysis"} in input order; sections that
+        still fail after retries carry an "error" instead
+    """
+    def analyze(section):
+        entry = {"section": section['section'], "header": section['header']}
+        try:
+            entry['analysis'] = analyze_section(section['content'], section['section'])
+        except OLLAMA_ERRORS as e:
+            print(f"  Section {section['section']} failed: {e}")
+            entry['analysis'] = ""
+            entry['error'] = str(e)
+        return entry
+    
+    workers = max(1, workers)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for section in sections:
+            pending.append(pool.submit(analyze, section))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+MERGE_PROMPT = """Combine these partial analyses from the {pdf_name} research report into one analysis.
+
+Keep the same headings (TOPIC, KEY_POINTS, NUMBERS, COMPANIES, TECHNOLOGIES, PREDICTIONS).
+Keep every specific number, company and prediction; drop repetition.
+Be concise. Return structured text, not JSON.
+
+PARTIAL ANALYSES:
+{analyses}
+"""
+
+SUMMARY_PROMPT = """Based on these section analyses from the {pdf_name} research report, create:
 
 1. EXECUTIVE_SUMMARY: 3-4 sentence overview
 2. TOP_THEMES: The 5 most important themes/trends
@@ -217,117 +674,374 @@ def generate_summary(all_analyses, pdf_name):
 5. INVESTMENT_IMPLICATIONS: 3-5 actionable insights
 
 SECTION ANALYSES:
-{combined[:6000]}
+{analyses}
 """
+
+def pack_batches(texts, max_tokens, count_tokens):
+    """Group consecutive texts up to max_tokens each (at least two per batch)"""
+    batches, batch, total = [], [], 0
+    for text in texts:
+        n = count_tokens(text)
+        if len(batch) >= 2 and total + n > max_tokens:
+            batches.append(batch)
+            batch, total = [], 0
+        batch.append(text)
+        total += n
+    if batch:
+        batches.append(batch)
+    return batches
+
+def generate_summary(all_analyses, pdf_name, workers=OLLAMA_WORKERS):
+    """
+    Generate overall summary from all section analyses (cached)
+    
+    Analyses are tree-reduced: each level packs neighbouring analyses into
+    batches that fit the context, merges the batches in parallel, and
+    repeats until a single batch is left for the final summary prompt. No
+    section is dropped, and every merge goes through the analysis cache,
+    so unchanged branches of the tree are not recomputed.
+    """
+    print("Generating overall summary...")
+    if not all_analyses:
+        return ""
+    
+    count_tokens = get_tokenizer()
+    budget = CONTEXT_TOKENS - RESPONSE_TOKENS - max(
+        count_tokens(template.format(pdf_name=pdf_name, analyses=''))
+        for template in (MERGE_PROMPT, SUMMARY_PROMPT))
+    separator = "\n\n---\n\n"
+    
+    level = [f"Section {i+1}:\n{a}" for i, a in enumerate(all_analyses)]
+    depth = 0
+    batches = pack_batches(level, budget, count_tokens)
     
-    response = ask_ollama(prompt)
+    while len(batches) > 1:
+        depth += 1
+        print(f"  Level {depth}: merging {len(level)} analyses in {len(batches)} batches...")
+        
+        def merge(batch):
+            return ask_cached(MERGE_PROMPT.format(pdf_name=pdf_name, analyses=separator.join(batch)))
+        
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            merged = list(pool.map(merge, batches))
+        level = [f"Part {i+1}:\n{m}" for i, m in enumerate(merged)]
+        batches = pack_batches(level, budget, count_tokens)
+    
+    prompt = SUMMARY_PROMPT.format(pdf_name=pdf_name, analyses=separator.join(level))
+    
+    response = ask_cached(prompt)
     return response
 
 # =============================================================================
-# MAIN PIPELINE
+# CHECKPOINTS
 # =============================================================================
 
-def process_pdf(pdf_path):
-    """Full processing pipeline"""
-    pdf_path = os.path.expanduser(pdf_path)
+def hash_file(path):
+    """sha256 of a file, read in blocks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def hash_inputs(*parts):
+    """sha256 over a step's inputs (file hashes, settings)"""
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode()).hexdigest()
+
+class Manifest:
+    """
+    Checkpoints for the pipeline in <output_dir>/manifest.json
     
-    if not os.path.exists(pdf_path):
-        print(f"ERROR: File not found: {pdf_path}")
-        sys.exit(1)
+    Each step records a hash of its inputs and of the files it wrote; a
+    step is done only while both still match, so changing the PDF or a
+    setting redoes that step and everything downstream of it. Sections
+    are checkpointed one by one as their analysis lands in analysis.jsonl.
+    """
+    
+    def __init__(self, output_dir):
+        self.output_dir = output_dir
+        self.path = f"{output_dir}/manifest.json"
+        try:
+            with open(self.path) as f:
+                self.data = json.load(f)
+        except (OSError, ValueError):
+            self.data = {}
+        self.data.setdefault('steps', {})
+        self.data.setdefault('sections', {})
+    
+    def save(self):
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(self.data, f, indent=2)
+        os.replace(tmp, self.path)
     
-    pdf_name = os.path.basename(pdf_path).replace('.pdf', '')
-    output_dir = os.path.dirname(pdf_path) + '/' + pdf_name
+    def is_done(self, step, inputs):
+        entry = self.data['steps'].get(step)
+        if not entry or entry.get('inputs') != inputs:
+            return False
+        for name, digest in entry['outputs'].items():
+            path = f"{self.output_dir}/{name}"
+            if not os.path.exists(path) or hash_file(path) != digest:
+                return False
+        return True
+    
+    def complete(self, step, inputs, outputs, **info):
+        """Mark a step done with the files it produced (plus any info to report on resume)"""
+        self.data['steps'][step] = {
+            "inputs": inputs,
+            "outputs": {name: hash_file(f"{self.output_dir}/{name}") for name in outputs},
+            "completed_at": datetime.now().isoformat(),
+            **info
+        }
+        self.save()
+    
+    def output_hash(self, step, name):
+        return self.data['steps'][step]['outputs'][name]
+    
+    def info(self, step, key):
+        return self.data['steps'][step].get(key)
+    
+    def section_done(self, section, key):
+        return self.data['sections'].get(str(section)) == key
+    
+    def complete_section(self, section, key):
+        self.data['sections'][str(section)] = key
+        self.save()
+
+
+def section_key(section):
+    """Identity of a section's analysis: model, prompt version and content"""
+    return hash_inputs(OLLAMA_MODEL, PROMPT_VERSION, section['content'])
+
+# =============================================================================
+# MAIN PIPELINE
+# =============================================================================
+
+def output_dir_for(pdf_path):
+    """<dir>/<name>/ next to the PDF"""
+    output_dir = Path(pdf_path).with_suffix('')
+    return output_dir.name, str(output_dir)
+
+def prepare_pdf(pdf_path, extract_workers=EXTRACT_WORKERS):
+    """
+    Steps 1-3 (CPU-bound): metadata, text and images
+    
+    Returns:
+        Job dict handed to analyze_pdf
+    """
+    started = time.time()
+    pdf_name, output_dir = output_dir_for(pdf_path)
     ensure_dir(output_dir)
     
-    print(f"\n{'='*60}")
-    print(f"PDF PROCESSOR")
-    print(f"{'='*60}")
-    print(f"Input:  {pdf_path}")
-    print(f"Output: {output_dir}")
-    print(f"{'='*60}\n")
+    manifest = Manifest(output_dir)
+    pdf_hash = hash_file(pdf_path)
     
     # Step 1: Metadata
     print("[1/6] Extracting metadata...")
-    metadata = get_pdf_info(pdf_path)
-    metadata['processed_at'] = datetime.now().isoformat()
-    metadata['source_file'] = pdf_path
-    
-    with open(f"{output_dir}/metadata.json", 'w') as f:
-        json.dump(metadata, f, indent=2)
+    inputs = hash_inputs(pdf_hash)
+    if manifest.is_done('metadata', inputs):
+        print("  (done, skipping)")
+        with open(f"{output_dir}/metadata.json") as f:
+            metadata = json.load(f)
+    else:
+        metadata = get_pdf_info(pdf_path)
+        metadata['processed_at'] = datetime.now().isoformat()
+        metadata['source_file'] = pdf_path
+        
+        with open(f"{output_dir}/metadata.json", 'w') as f:
+            json.dump(metadata, f, indent=2)
+        manifest.complete('metadata', inputs, ['metadata.json'])
     print(f"  Pages: {metadata.get('pages', 'unknown')}")
     
     # Step 2: Text extraction
     print("[2/6] Extracting text...")
-    full_text = extract_text(pdf_path, output_dir)
-    print(f"  Extracted {len(full_text):,} characters")
+    if manifest.is_done('text', inputs):
+        print("  (done, skipping)")
+        chars = manifest.info('text', 'chars')
+        if chars is None:
+            # Checkpointed before the count was recorded
+            with open(f"{output_dir}/full-text.txt", newline='') as f:
+                chars = sum(len(line) for line in f)
+    else:
+        chars = len(extract_text(pdf_path, output_dir, pages=page_count(pdf_path, metadata),
+                                 workers=extract_workers))
+        manifest.complete('text', inputs, ['full-text.txt'], chars=chars)
+    print(f"  Extracted {chars:,} characters")
     
     # Step 3: Image extraction
     print("[3/6] Extracting images...")
-    images = extract_images(pdf_path, output_dir)
+    if manifest.is_done('images', inputs):
+        print("  (done, skipping)")
+        with open(f"{output_dir}/images.json") as f:
+            images = json.load(f)
+    else:
+        images = extract_images(pdf_path, output_dir)
+        
+        with open(f"{output_dir}/images.json", 'w') as f:
+            json.dump(images, f, indent=2)
+        manifest.complete('images', inputs,
+                           ['images.json'] + [f"images/{image['file']}" for image in images])
     print(f"  Extracted {len(images)} images (>5KB)")
     
-    with open(f"{output_dir}/images.json", 'w') as f:
-        json.dump(images, f, indent=2)
+    return {
+        "pdf_path": pdf_path,
+        "pdf_name": pdf_name,
+        "output_dir": output_dir,
+        "metadata": metadata,
+        "chars": chars,
+        "images": images,
+        "extract_seconds": round(time.time() - started, 2)
+    }
+
+def analyze_pdf(job):
+    """
+    Steps 4-6 (I/O-bound): chunking, Ollama analysis and summary
     
-    # Step 4: Chunking
-    print("[4/6] Chunking content...")
+    Returns:
+        The job dict, updated with section counts and the summary
+    """
+    started = time.time()
+    pdf_name, output_dir = job['pdf_name'], job['output_dir']
+    metadata, images = job['metadata'], job['images']
+    manifest = Manifest(output_dir)
     
-    # Try header-based first
-    header_chunks = chunk_by_headers(full_text)
+    # Steps 4-5: Chunks stream from full-text.txt straight into analysis
+    print("[4/6] Chunking content...")
+    chunk_inputs = hash_inputs(manifest.output_hash('text', 'full-text.txt'), TOKENIZER,
+                               CONTEXT_TOKENS, RESPONSE_TOKENS, CHUNK_OVERLAP_TOKENS, PROMPT_VERSION)
+    chunked = manifest.is_done('chunks', chunk_inputs)
+    if chunked:
+        print("  (done, skipping)")
     
-    # If that didn't work well, fall back to size-based
-    if len(header_chunks) < 5:
-        print("  Using size-based chunking...")
-        chunks = [{"header": f"Section {i+1}", "content": c} 
-                  for i, c in enumerate(chunk_by_size(full_text))]
-    else:
-        print("  Using header-based chunking...")
-        chunks = header_chunks
+    print("[5/6] Analyzing with Ollama...")
+    jsonl_path = f"{output_dir}/analysis.jsonl"
     
-    print(f"  Created {len(chunks)} sections")
+    # Analyses checkpointed by earlier runs; reused where the section is unchanged
+    finished = {}
+    if os.path.exists(jsonl_path):
+        with open(jsonl_path) as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # Torn last line from a crash
+                if manifest.section_done(entry['section'], entry.get('key')):
+                    finished[entry['section']] = entry
     
-    with open(f"{output_dir}/sections.json", 'w') as f:
-        json.dump(chunks, f, indent=2)
+    with open(jsonl_path, 'w') as f:
+        for entry in finished.values():
+            f.write(json.dumps(entry) + '\n')
     
-    # Step 5: Ollama analysis
-    print("[5/6] Analyzing with Ollama...")
+    chunk_count = 0
+    wanted = 0
+    resumed = 0
+    keys = {}
+    analyzed = {}
     
-    analyses = []
-    chunks_to_process = chunks[:MAX_CHUNKS_TO_PROCESS] if MAX_CHUNKS_TO_PROCESS else chunks
+    def sections_to_analyze(chunks):
+        nonlocal chunk_count, wanted, resumed
+        for i, chunk in enumerate(chunks):
+            chunk_count += 1
+            if MAX_CHUNKS_TO_PROCESS and i >= MAX_CHUNKS_TO_PROCESS:
+                continue  # Still written to sections.json
+            if len(chunk['content']) < 100:  # Skip tiny chunks
+                continue
+            wanted += 1
+            section = {"section": i+1, "header": chunk['header'], "content": chunk['content']}
+            key = section_key(section)
+            if finished.get(i+1, {}).get('key') == key:
+                analyzed[i+1] = finished[i+1]
+                resumed += 1
+                continue
+            keys[i+1] = key
+            yield section
     
-    for i, chunk in enumerate(chunks_to_process):
-        content = chunk.get('content', chunk) if isinstance(chunk, dict) else chunk
-        if len(content) < 100:  # Skip tiny chunks
-            continue
+    with open(f"{output_dir}/full-text.txt") as text, open(jsonl_path, 'a') as jsonl:
+        if chunked:
+            with open(f"{output_dir}/sections.json") as f:
+                chunks = json.load(f)
+        else:
+            chunks = tee_json_array(iter_chunks(text), f"{output_dir}/sections.json")
         
-        analysis = analyze_section(content, i+1, len(chunks_to_process))
-        analyses.append({
-            "section": i+1,
-            "header": chunk.get('header', f'Section {i+1}'),
-            "analysis": analysis
-        })
+        for entry in analyze_sections(sections_to_analyze(chunks)):
+            if entry.get('error'):
+                continue  # Not checkpointed; retried on the next run
+            entry['key'] = keys.pop(entry['section'])
+            jsonl.write(json.dumps(entry) + '\n')
+            jsonl.flush()
+            analyzed[entry['section']] = entry
+            manifest.complete_section(entry['section'], entry['key'])
+    
+    if not chunked:
+        manifest.complete('chunks', chunk_inputs, ['sections.json'])
+    print(f"  Created {chunk_count} sections")
+    if resumed:
+        print(f"  Resumed {resumed} sections analyzed by an earlier run")
     
+    analyses = [analyzed[n] for n in sorted(analyzed)]
+    failed = wanted - len(analyses)
+    if failed:
+        print(f"  {failed} sections failed after {OLLAMA_RETRIES} attempts; rerun to retry them")
+    
+    # No step checkpoint: sections resume one by one from analysis.jsonl
     with open(f"{output_dir}/analysis.json", 'w') as f:
         json.dump(analyses, f, indent=2)
     
     # Step 6: Summary
     print("[6/6] Generating summary...")
-    summary_text = generate_summary(
-        [a['analysis'] for a in analyses],
-        pdf_name
-    )
+    summary_inputs = hash_inputs(hash_file(f"{output_dir}/analysis.json"), OLLAMA_MODEL, PROMPT_VERSION)
+    if manifest.is_done('summary', summary_inputs):
+        print("  (done, skipping)")
+        with open(f"{output_dir}/summary.json") as f:
+            summary_text = json.load(f)['summary']
+    else:
+        summary_text = generate_summary(
+            [a['analysis'] for a in analyses if a['analysis']],
+            pdf_name
+        )
+        
+        summary = {
+            "pdf_name": pdf_name,
+            "pages": metadata.get('pages'),
+            "sections_analyzed": len(analyses),
+            "images_extracted": len(images),
+            "summary": summary_text,
+            "processed_at": datetime.now().isoformat()
+        }
+        
+        with open(f"{output_dir}/summary.json", 'w') as f:
+            json.dump(summary, f, indent=2)
+        if not failed:
+            manifest.complete('summary', summary_inputs, ['summary.json'])
     
-    summary = {
-        "pdf_name": pdf_name,
-        "pages": metadata.get('pages'),
+    job.update({
+        "sections": chunk_count,
         "sections_analyzed": len(analyses),
-        "images_extracted": len(images),
+        "sections_failed": failed,
         "summary": summary_text,
-        "processed_at": datetime.now().isoformat()
-    }
+        "analyze_seconds": round(time.time() - started, 2)
+    })
+    return job
+
+def process_pdf(pdf_path):
+    """Full processing pipeline"""
+    pdf_path = os.path.expanduser(pdf_path)
     
-    with open(f"{output_dir}/summary.json", 'w') as f:
-        json.dump(summary, f, indent=2)
+    if not os.path.exists(pdf_path):
+        print(f"ERROR: File not found: {pdf_path}")
+        sys.exit(1)
+    
+    pdf_name, output_dir = output_dir_for(pdf_path)
+    
+    print(f"\n{'='*60}")
+    print(f"PDF PROCESSOR")
+    print(f"{'='*60}")
+    print(f"Input:  {pdf_path}")
+    print(f"Output: {output_dir}")
+    print(f"{'='*60}\n")
+    
+    job = analyze_pdf(prepare_pdf(pdf_path))
+    chunk_count, images, summary_text = job['sections'], job['images'], job['summary']
     
     # Done
     print(f"\n{'='*60}")
@@ -336,7 +1050,7 @@ def process_pdf(pdf_path):
     print(f"\nOutput files in: {output_dir}/")
     print(f"  - metadata.json    (PDF info)")
     print(f"  - full-text.txt    (All text)")
-    print(f"  - sections.json    ({len(chunks)} sections)")
+    print(f"  - sections.json    ({chunk_count} sections)")
     print(f"  - images/          ({len(images)} images)")
     print(f"  - analysis.json    (Ollama analysis)")
     print(f"  - summary.json     (Executive summary)")
@@ -348,20 +1062,143 @@ def process_pdf(pdf_path):
     
     return output_dir
 
+def expand_inputs(args):
+    """PDF paths from files, directories (their *.pdf) and glob patterns, in order"""
+    paths = []
+    for arg in args:
+        arg = os.path.expanduser(arg)
+        if os.path.isdir(arg):
+            paths.extend(sorted(str(p) for p in Path(arg).iterdir() if p.suffix.lower() == '.pdf'))
+        elif glob.has_magic(arg):
+            paths.extend(sorted(p for p in glob.glob(arg, recursive=True) if p.lower().endswith('.pdf')))
+        else:
+            paths.append(arg)
+    return list(dict.fromkeys(paths))
+
+def process_batch(pdf_paths, report_path):
+    """
+    Process many PDFs, overlapping one PDF's extraction with another's analysis
+    
+    Extraction (steps 1-3) runs on a process pool and analysis (steps 4-6)
+    on a thread pool; each PDF moves to the analysis pool as soon as its
+    extraction finishes. A failure only fails that PDF.
+    
+    Returns:
+        Aggregate run report (also written to report_path)
+    """
+    started = time.time()
+    extract_workers = max(1, EXTRACT_WORKERS // BATCH_EXTRACT_WORKERS)
+    results = []
+    
+    def failed(pdf_path, stage, e):
+        print(f"  FAILED {pdf_path} ({stage}): {e}")
+        return {"pdf_path": pdf_path, "status": "failed", "stage": stage, "error": str(e)}
+    
+    print(f"\n{'='*60}")
+    print(f"PDF PROCESSOR - BATCH ({len(pdf_paths)} PDFs)")
+    print(f"{'='*60}\n")
+    
+    with ProcessPoolExecutor(max_workers=BATCH_EXTRACT_WORKERS) as extract_pool, \
+         ThreadPoolExecutor(max_workers=BATCH_ANALYZE_WORKERS) as analyze_pool:
+        extracting = {}
+        for pdf_path in pdf_paths:
+            if not os.path.exists(pdf_path):
+                results.append(failed(pdf_path, "input", "File not found"))
+                continue
+            extracting[extract_pool.submit(prepare_pdf, pdf_path, extract_workers)] = pdf_path
+        
+        analyzing = {}
+        for future in as_completed(extracting):
+            pdf_path = extracting[future]
+            try:
+                job = future.result()
+            except Exception as e:
+                results.append(failed(pdf_path, "extract", e))
+                continue
+            print(f"  Extracted {pdf_path}, analyzing...")
+            analyzing[analyze_pool.submit(analyze_pdf, job)] = pdf_path
+        
+        for future in as_completed(analyzing):
+            pdf_path = analyzing[future]
+            try:
+                job = future.result()
+            except Exception as e:
+                results.append(failed(pdf_path, "analyze", e))
+                continue
+            job['status'] = "ok" if not job['sections_failed'] else "partial"
+            print(f"  Finished {pdf_path}")
+            results.append(job)
+    
+    order = {p: i for i, p in enumerate(pdf_paths)}
+    results.sort(key=lambda r: order[r['pdf_path']])
+    documents = [{
+        "pdf": r['pdf_path'],
+        "status": r['status'],
+        **({"stage": r['stage'], "error": r['error']} if r['status'] == "failed" else {
+            "output_dir": r['output_dir'],
+            "pages": r['metadata'].get('pages'),
+            "characters": r['chars'],
+            "images": len(r['images']),
+            "sections": r['sections'],
+            "sections_analyzed": r['sections_analyzed'],
+            "sections_failed": r['sections_failed'],
+            "extract_seconds": r['extract_seconds'],
+            "analyze_seconds": r['analyze_seconds'],
+        })
+    } for r in results]
+    
+    report = {
+        "processed_at": datetime.now().isoformat(),
+        "model": OLLAMA_MODEL,
+        "wall_seconds": round(time.time() - started, 2),
+        "pdfs": len(documents),
+        "ok": sum(1 for d in documents if d['status'] == "ok"),
+        "partial": sum(1 for d in documents if d['status'] == "partial"),
+        "failed": sum(1 for d in documents if d['status'] == "failed"),
+        "pages": sum(int(d.get('pages') or 0) for d in documents),
+        "sections_analyzed": sum(d.get('sections_analyzed', 0) for d in documents),
+        "sections_failed": sum(d.get('sections_failed', 0) for d in documents),
+        "documents": documents
+    }
+    
+    with open(report_path, 'w') as f:
+        json.dump(report, f, indent=2)
+    
+    print(f"\n{'='*60}")
+    print("BATCH COMPLETE")
+    print(f"{'='*60}")
+    for d in documents:
+        detail = d.get('error') or f"{d['sections_analyzed']} sections, {d['extract_seconds']}s + {d['analyze_seconds']}s"
+        print(f"  {d['status']:<8} {os.path.basename(d['pdf'])}: {detail}")
+    print(f"\n{report['ok']} ok, {report['partial']} partial, {report['failed']} failed "
+          f"in {report['wall_seconds']}s")
+    print(f"Report: {report_path}")
+    
+    return report
+
 # =============================================================================
 # CLI
 # =============================================================================
 
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: python3 pdf-processor.py <pdf_file>")
-        print("")
-        print("Example:")
-        print("  python3 pdf-processor.py ~/Downloads/ark-big-ideas-2026.pdf")
-        print("")
-        print("Requirements:")
-        print("  brew install poppler")
-        print("  ollama pull llama2")
+    parser = argparse.ArgumentParser(
+        description="Extract, chunk and analyze PDFs with Ollama",
+        epilog="Requirements: brew install poppler; ollama pull llama2; "
+               "ollama serve (HTTP API on OLLAMA_HOST, default localhost:11434)"
+    )
+    parser.add_argument('inputs', nargs='+', metavar='PDF',
+                        help="PDF file, directory of PDFs, or glob (e.g. 'reports/**/*.pdf')")
+    parser.add_argument('--report', default='pdf-batch-report.json',
+                        help="Batch mode: where to write the aggregate run report")
+    args = parser.parse_args()
+    
+    pdf_paths = expand_inputs(args.inputs)
+    if not pdf_paths:
+        print("ERROR: No PDFs found")
         sys.exit(1)
     
-    process_pdf(sys.argv[1])
+    if len(args.inputs) == 1 and pdf_paths == [os.path.expanduser(args.inputs[0])]:
+        process_pdf(pdf_paths[0])
+    else:
+        report = process_batch(pdf_paths, args.report)
+        sys.exit(1 if report['failed'] else 0)